@@ -6,16 +6,29 @@ No SAS software required!
 from __future__ import division, absolute_import, print_function,\
     unicode_literals
 import atexit
+import bisect
+import collections
 import csv
+import hashlib
+import itertools
+import json
 import logging
 import math
+import mmap
+import multiprocessing
+import operator
 import os
 import platform
+import shutil
 import struct
 import sys
-from datetime import datetime, timedelta
+import tempfile
+import threading
+import zipfile
+from datetime import date, datetime, timedelta
 
 import six
+from six.moves import queue
 xrange = six.moves.range
 
 __all__ = ['SAS7BDAT']
@@ -66,6 +79,8 @@ class Decompressor(object):
     def decompress_row(self, offset, length, result_length, page):
         raise NotImplementedError
 
+    # to_ord() and to_chr() are no longer used by the decompressors here,
+    # they are kept for subclasses written against earlier versions
     @staticmethod
     def to_ord(int_or_str):
         if isinstance(int_or_str, int):
@@ -84,276 +99,1297 @@ class Decompressor(object):
 
 class RLEDecompressor(Decompressor):
     """
-    Decompresses data using the Run Length Encoding algorithm
+    Decompresses data using the Run Length Encoding algorithm. Rows are
+    written into a bytearray of result_length: runs are filled a slice at
+    a time and literal bytes are copied straight from the page.
     """
+    # Control bytes of literal copies, mapped to the number of bytes copied
+    # on top of the count in their low nibble
+    LITERAL_COPIES = {0x80: 1, 0x90: 17, 0xA0: 33, 0xB0: 49}
+
     def decompress_row(self, offset, length, result_length, page):
-        b = self.to_ord
-        c = self.to_chr
-        current_result_array_index = 0
-        result = []
-        i = 0
-        for j in xrange(length):
-            if i != j:
-                continue
-            control_byte = b(page[offset + i]) & 0xF0
-            end_of_first_byte = b(page[offset + i]) & 0x0F
-            if control_byte == 0x00:
-                if i != (length - 1):
-                    count_of_bytes_to_copy = (
-                        (b(page[offset + i + 1]) & 0xFF) +
-                        64 +
-                        end_of_first_byte * 256
-                    )
-                    start = offset + i + 2
-                    end = start + count_of_bytes_to_copy
-                    result.append(c(page[start:end]))
-                    i += count_of_bytes_to_copy + 1
-                    current_result_array_index += count_of_bytes_to_copy
+        indexbytes = six.indexbytes
+        int2byte = six.int2byte
+        view = memoryview(page)
+        result = bytearray(result_length)
+        # Bytes written so far, never more than len(result)
+        pos = 0
+        i = offset
+        end = offset + length
+        while i < end:
+            control_byte = indexbytes(page, i) & 0xF0
+            end_of_first_byte = indexbytes(page, i) & 0x0F
+            if control_byte in self.LITERAL_COPIES:
+                count = min(end_of_first_byte +
+                            self.LITERAL_COPIES[control_byte], end - (i + 1))
+                result[pos:pos + count] = view[i + 1:i + 1 + count]
+                pos += count
+                i += count
+            elif control_byte == 0x00:
+                if i != end - 1:
+                    count = (indexbytes(page, i + 1) + 64 +
+                             end_of_first_byte * 256)
+                    literal = view[i + 2:i + 2 + count]
+                    result[pos:pos + count] = literal
+                    pos += len(literal)
+                    i += count + 1
             elif control_byte == 0x40:
-                copy_counter = (
-                    end_of_first_byte * 16 +
-                    (b(page[offset + i + 1]) & 0xFF)
-                )
-                for _ in xrange(copy_counter + 18):
-                    result.append(c(page[offset + i + 2]))
-                    current_result_array_index += 1
+                count = end_of_first_byte * 16 + indexbytes(page, i + 1) + 18
+                result[pos:pos + count] =\
+                    int2byte(indexbytes(page, i + 2)) * count
+                pos += count
                 i += 2
             elif control_byte == 0x60:
-                for _ in xrange(end_of_first_byte * 256 +
-                                (b(page[offset + i + 1]) & 0xFF) + 17):
-                    result.append(c(0x20))
-                    current_result_array_index += 1
+                count = end_of_first_byte * 256 + indexbytes(page, i + 1) + 17
+                result[pos:pos + count] = b' ' * count
+                pos += count
                 i += 1
             elif control_byte == 0x70:
-                for _ in xrange((b(page[offset + i + 1]) & 0xFF) + 17):
-                    result.append(c(0x00))
-                    current_result_array_index += 1
+                pos = self._skip_zeros(result, pos,
+                                       indexbytes(page, i + 1) + 17)
                 i += 1
-            elif control_byte == 0x80:
-                count_of_bytes_to_copy = min(end_of_first_byte + 1,
-                                             length - (i + 1))
-                start = offset + i + 1
-                end = start + count_of_bytes_to_copy
-                result.append(c(page[start:end]))
-                i += count_of_bytes_to_copy
-                current_result_array_index += count_of_bytes_to_copy
-            elif control_byte == 0x90:
-                count_of_bytes_to_copy = min(end_of_first_byte + 17,
-                                             length - (i + 1))
-                start = offset + i + 1
-                end = start + count_of_bytes_to_copy
-                result.append(c(page[start:end]))
-                i += count_of_bytes_to_copy
-                current_result_array_index += count_of_bytes_to_copy
-            elif control_byte == 0xA0:
-                count_of_bytes_to_copy = min(end_of_first_byte + 33,
-                                             length - (i + 1))
-                start = offset + i + 1
-                end = start + count_of_bytes_to_copy
-                result.append(c(page[start:end]))
-                i += count_of_bytes_to_copy
-                current_result_array_index += count_of_bytes_to_copy
-            elif control_byte == 0xB0:
-                count_of_bytes_to_copy = min(end_of_first_byte + 49,
-                                             length - (i + 1))
-                start = offset + i + 1
-                end = start + count_of_bytes_to_copy
-                result.append(c(page[start:end]))
-                i += count_of_bytes_to_copy
-                current_result_array_index += count_of_bytes_to_copy
             elif control_byte == 0xC0:
-                for _ in xrange(end_of_first_byte + 3):
-                    result.append(c(page[offset + i + 1]))
-                    current_result_array_index += 1
+                count = end_of_first_byte + 3
+                result[pos:pos + count] =\
+                    int2byte(indexbytes(page, i + 1)) * count
+                pos += count
                 i += 1
             elif control_byte == 0xD0:
-                for _ in xrange(end_of_first_byte + 2):
-                    result.append(c(0x40))
-                    current_result_array_index += 1
+                count = end_of_first_byte + 2
+                result[pos:pos + count] = b'@' * count
+                pos += count
             elif control_byte == 0xE0:
-                for _ in xrange(end_of_first_byte + 2):
-                    result.append(c(0x20))
-                    current_result_array_index += 1
+                count = end_of_first_byte + 2
+                result[pos:pos + count] = b' ' * count
+                pos += count
             elif control_byte == 0xF0:
-                for _ in xrange(end_of_first_byte + 2):
-                    result.append(c(0x00))
-                    current_result_array_index += 1
+                pos = self._skip_zeros(result, pos, end_of_first_byte + 2)
             else:
                 self.parent.logger.error('unknown control byte: %s',
                                          control_byte)
             i += 1
-        return b''.join(result)
+        if pos < len(result):
+            del result[pos:]
+        return result
+
+    @staticmethod
+    def _skip_zeros(result, pos, count):
+        """
+        Writes count zero bytes at pos, which is a no-op inside the zero
+        filled result, and returns the new position.
+        """
+        pos += count
+        if pos > len(result):
+            result.extend(b'\x00' * (pos - len(result)))
+        return pos
 
 
 class RDCDecompressor(Decompressor):
     """
-    Decompresses data using the Ross Data Compression algorithm
+    Decompresses data using the Ross Data Compression algorithm. The
+    compressed row is read through a memoryview and written into a
+    bytearray; control bits are tested directly and back references are
+    copied as slices.
     """
-    def bytes_to_bits(self, src, offset, length):
-        result = [0] * (length * 8)
-        for i in xrange(length):
-            b = src[offset + i]
-            for bit in xrange(8):
-                result[8 * i + (7 - bit)] = 0 if ((b & (1 << bit)) == 0) else 1
-        return result
-
-    def ensure_capacity(self, src, capacity):
-        if capacity >= len(src):
-            new_len = max(capacity, 2 * len(src))
-            src.extend([0] * (new_len - len(src)))
-        return src
-
-    def is_short_rle(self, first_byte_of_cb):
-        return first_byte_of_cb in set([0x00, 0x01, 0x02, 0x03, 0x04, 0x05])
-
-    def is_single_byte_marker(self, first_byte_of_cb):
-        return first_byte_of_cb in set([0x02, 0x04, 0x06, 0x08, 0x0A])
-
-    def is_two_bytes_marker(self, double_bytes_cb):
-        return len(double_bytes_cb) == 2 and\
-            ((double_bytes_cb[0] >> 4) & 0xF) > 2
-
-    def is_three_bytes_marker(self, three_byte_marker):
-        flag = three_byte_marker[0] >> 4
-        return len(three_byte_marker) == 3 and (flag & 0xF) in set([1, 2])
-
-    def get_length_of_rle_pattern(self, first_byte_of_cb):
-        if first_byte_of_cb <= 0x05:
-            return first_byte_of_cb + 3
-        return 0
-
-    def get_length_of_one_byte_pattern(self, first_byte_of_cb):
-        return first_byte_of_cb + 14\
-            if self.is_single_byte_marker(first_byte_of_cb) else 0
-
-    def get_length_of_two_bytes_pattern(self, double_bytes_cb):
-        return (double_bytes_cb[0] >> 4) & 0xF
-
-    def get_length_of_three_bytes_pattern(self, p_type, three_byte_marker):
-        if p_type == 1:
-            return 19 + (three_byte_marker[0] & 0xF) +\
-                (three_byte_marker[1] * 16)
-        elif p_type == 2:
-            return three_byte_marker[2] + 16
-        return 0
-
-    def get_offset_for_one_byte_pattern(self, first_byte_of_cb):
-        if first_byte_of_cb == 0x08:
-            return 24
-        elif first_byte_of_cb == 0x0A:
-            return 40
-        return 0
-
-    def get_offset_for_two_bytes_pattern(self, double_bytes_cb):
-        return 3 + (double_bytes_cb[0] & 0xF) + (double_bytes_cb[1] * 16)
-
-    def get_offset_for_three_bytes_pattern(self, triple_bytes_cb):
-        return 3 + (triple_bytes_cb[0] & 0xF) + (triple_bytes_cb[1] * 16)
-
-    def clone_byte(self, b, length):
-        return [b] * length
-
     def decompress_row(self, offset, length, result_length, page):
-        b = self.to_ord
-        c = self.to_chr
-        src_row = [b(x) for x in page[offset:offset + length]]
-        out_row = [0] * result_length
+        src = memoryview(page)[offset:offset + length]
+        if six.PY2:
+            # Items of a memoryview are str on Python 2
+            src = bytearray(src)
+        src_length = len(src)
+        out = bytearray(result_length)
+        grow = self._grow
         src_offset = 0
         out_offset = 0
-        while src_offset < (len(src_row) - 2):
-            prefix_bits = self.bytes_to_bits(src_row, src_offset, 2)
+        while src_offset < src_length - 2:
+            control = (src[src_offset] << 8) | src[src_offset + 1]
             src_offset += 2
-            for bit_index in xrange(16):
-                if src_offset >= len(src_row):
+            if not control:
+                # Sixteen literal bytes in a row
+                count = min(16, src_length - src_offset)
+                if out_offset + count > len(out):
+                    grow(out, out_offset + count - 1)
+                out[out_offset:out_offset + count] =\
+                    src[src_offset:src_offset + count]
+                src_offset += count
+                out_offset += count
+                continue
+            mask = 0x8000
+            while mask:
+                if src_offset >= src_length:
                     break
-                if prefix_bits[bit_index] == 0:
-                    out_row = self.ensure_capacity(out_row, out_offset)
-                    out_row[out_offset] = src_row[src_offset]
+                if not control & mask:
+                    if out_offset >= len(out):
+                        grow(out, out_offset)
+                    out[out_offset] = src[src_offset]
                     src_offset += 1
                     out_offset += 1
+                    mask >>= 1
                     continue
-                marker_byte = src_row[src_offset]
-                try:
-                    next_byte = src_row[src_offset + 1]
-                except IndexError:
+                mask >>= 1
+                marker_byte = src[src_offset]
+                if src_offset + 1 >= src_length:
                     break
-                if self.is_short_rle(marker_byte):
-                    length = self.get_length_of_rle_pattern(marker_byte)
-                    out_row = self.ensure_capacity(
-                        out_row, out_offset + length
-                    )
-                    pattern = self.clone_byte(next_byte, length)
-                    out_row[out_offset:out_offset + length] = pattern
-                    out_offset += length
+                next_byte = src[src_offset + 1]
+                if marker_byte <= 0x05:
+                    # Short run of next_byte
+                    count = marker_byte + 3
+                    grow(out, out_offset + count)
+                    out[out_offset:out_offset + count] =\
+                        bytearray((next_byte,)) * count
                     src_offset += 2
+                    out_offset += count
                     continue
-                elif self.is_single_byte_marker(marker_byte) and not\
-                        ((next_byte & 0xF0) == ((next_byte << 4) & 0xF0)):
-                    length = self.get_length_of_one_byte_pattern(marker_byte)
-                    out_row = self.ensure_capacity(
-                        out_row, out_offset + length
-                    )
-                    back_offset = self.get_offset_for_one_byte_pattern(
-                        marker_byte
-                    )
-                    start = out_offset - back_offset
-                    end = start + length
-                    out_row[out_offset:out_offset + length] =\
-                        out_row[start:end]
+                if marker_byte in (0x06, 0x08, 0x0A) and\
+                        (next_byte & 0xF0) != ((next_byte << 4) & 0xF0):
+                    # One byte back reference
+                    count = marker_byte + 14
+                    back_offset = {0x08: 24, 0x0A: 40}.get(marker_byte, 0)
                     src_offset += 1
-                    out_offset += length
-                    continue
-                two_bytes_marker = src_row[src_offset:src_offset + 2]
-                if self.is_two_bytes_marker(two_bytes_marker):
-                    length = self.get_length_of_two_bytes_pattern(
-                        two_bytes_marker
-                    )
-                    out_row = self.ensure_capacity(
-                        out_row, out_offset + length
-                    )
-                    back_offset = self.get_offset_for_two_bytes_pattern(
-                        two_bytes_marker
-                    )
-                    start = out_offset - back_offset
-                    end = start + length
-                    out_row[out_offset:out_offset + length] =\
-                        out_row[start:end]
+                elif marker_byte >> 4 > 2:
+                    # Two byte back reference
+                    count = marker_byte >> 4
+                    back_offset = 3 + (marker_byte & 0x0F) + next_byte * 16
                     src_offset += 2
-                    out_offset += length
-                    continue
-                three_bytes_marker = src_row[src_offset:src_offset + 3]
-                if self.is_three_bytes_marker(three_bytes_marker):
-                    p_type = (three_bytes_marker[0] >> 4) & 0x0F
-                    back_offset = 0
-                    if p_type == 2:
-                        back_offset = self.get_offset_for_three_bytes_pattern(
-                            three_bytes_marker
-                        )
-                    length = self.get_length_of_three_bytes_pattern(
-                        p_type, three_bytes_marker
-                    )
-                    out_row = self.ensure_capacity(
-                        out_row, out_offset + length
-                    )
-                    if p_type == 1:
-                        pattern = self.clone_byte(
-                            three_bytes_marker[2], length
-                        )
-                    else:
-                        start = out_offset - back_offset
-                        end = start + length
-                        pattern = out_row[start:end]
-                    out_row[out_offset:out_offset + length] = pattern
+                elif marker_byte >> 4 in (1, 2) and\
+                        src_offset + 2 < src_length:
+                    # Three byte run or back reference
+                    third_byte = src[src_offset + 2]
                     src_offset += 3
-                    out_offset += length
-                    continue
+                    if marker_byte >> 4 == 1:
+                        count = 19 + (marker_byte & 0x0F) + next_byte * 16
+                        grow(out, out_offset + count)
+                        out[out_offset:out_offset + count] =\
+                            bytearray((third_byte,)) * count
+                        out_offset += count
+                        continue
+                    count = third_byte + 16
+                    back_offset = 3 + (marker_byte & 0x0F) + next_byte * 16
                 else:
                     self.parent.logger.error(
-                        'unknown marker %s at offset %s', src_row[src_offset],
+                        'unknown marker %s at offset %s', marker_byte,
                         src_offset
                     )
                     break
-        return b''.join([c(x) for x in out_row])
+                grow(out, out_offset + count)
+                start = out_offset - back_offset
+                out[out_offset:out_offset + count] = out[start:start + count]
+                out_offset += count
+        return out
+
+    @staticmethod
+    def _grow(out, capacity):
+        """
+        Makes room in out for writing up to capacity, at least doubling
+        its size when it has to grow.
+        """
+        if capacity >= len(out):
+            out.extend(bytearray(max(capacity, 2 * len(out)) - len(out)))
+
+
+SAS_EPOCH = datetime(1960, 1, 1)
+
+
+def _convert_number(val):
+    if val != val:
+        return ''
+    i = int(val)
+    if i == val:
+        return i
+    return val
+
+
+def _convert_datetime(val):
+    if val != val:
+        return ''
+    return SAS_EPOCH + timedelta(seconds=val)
+
+
+def _convert_time(val):
+    if val != val:
+        return ''
+    return (SAS_EPOCH + timedelta(seconds=val)).time()
+
+
+# Dates from 1900 through 2099 are looked up in a table, filled on first use
+# by _fill_date_table(), instead of being computed one by one
+_DATE_TABLE_START = (date(1900, 1, 1) - SAS_EPOCH.date()).days
+_DATE_TABLE_STOP = (date(2100, 1, 1) - SAS_EPOCH.date()).days
+_DATE_TABLE = []
+
+
+def _fill_date_table():
+    if not _DATE_TABLE:
+        first = SAS_EPOCH.date() + timedelta(days=_DATE_TABLE_START)
+        _DATE_TABLE.extend(first + timedelta(days=i) for i in
+                           xrange(_DATE_TABLE_STOP - _DATE_TABLE_START))
+
+
+def _convert_date(val):
+    if val != val:
+        return ''
+    i = int(val)
+    if i == val and _DATE_TABLE_START <= i < _DATE_TABLE_STOP and\
+            _DATE_TABLE:
+        return _DATE_TABLE[i - _DATE_TABLE_START]
+    return (SAS_EPOCH + timedelta(days=val)).date()
+
+
+def _identity(val):
+    return val
+
+
+class StringDecoder(object):
+    """
+    Decodes the raw bytes of one string column. Decoded values are cached
+    by their raw bytes, so each distinct value is stripped and decoded
+    once and shared by all the rows holding it. Once a column turns out to
+    hold more than string_cache_size distinct values the cache is dropped
+    and values are decoded one by one.
+    """
+    def __init__(self, parent):
+        self.encoding = parent.encoding
+        self.encoding_errors = parent.encoding_errors
+        self.max_size = parent.string_cache_size
+        self.cache = {}
+        self.enabled = self.max_size > 0
+        # Dictionary encoding, see encode_array()
+        self.categories = []
+        self.category_codes = {}
+
+    def decode(self, val):
+        string = self.cache.get(val)
+        if string is None:
+            string = val.strip(b'\x00').strip().decode(self.encoding,
+                                                       self.encoding_errors)
+            if self.enabled:
+                self.cache[val] = string
+                if len(self.cache) > self.max_size:
+                    self.disable()
+        return string
+
+    def disable(self):
+        self.enabled = False
+        self.cache = {}
+
+    def decode_array(self, raw):
+        """
+        Decodes a NumPy array of raw strings into an object array. While
+        the cache is on only the distinct values in raw are decoded.
+        """
+        import numpy as np
+        decode = self.decode
+        if self.enabled and len(raw) > 1:
+            uniques, inverse = np.unique(raw, return_inverse=True)
+            if len(uniques) <= self.max_size:
+                values = np.empty(len(uniques), dtype=object)
+                values[:] = [decode(x) for x in uniques.tolist()]
+                return values[inverse.ravel()]
+            self.disable()
+        values = np.empty(len(raw), dtype=object)
+        values[:] = [decode(x) for x in raw.tolist()]
+        return values
+
+    def encode_array(self, raw, shared=True):
+        """
+        Dictionary encodes a NumPy array of raw strings into a
+        DictionaryColumn. Codes are kept for the life of the decoder, so
+        they mean the same in every batch. If shared is false, the
+        categories are only the distinct values in raw instead.
+        """
+        import numpy as np
+        uniques, inverse = np.unique(raw, return_inverse=True)
+        if shared:
+            categories = self.categories
+            category_codes = self.category_codes
+        else:
+            categories = []
+            category_codes = {}
+        remap = np.empty(len(uniques), dtype=np.int32)
+        for i, x in enumerate(uniques.tolist()):
+            value = self.decode(x)
+            code = category_codes.get(value)
+            if code is None:
+                code = category_codes[value] = len(categories)
+                categories.append(value)
+            remap[i] = code
+        values = np.empty(len(categories), dtype=object)
+        values[:] = categories
+        return DictionaryColumn(remap[inverse.ravel()], values)
+
+
+class RowDecoder(object):
+    """
+    Decodes rows using a layout compiled once from the column metadata.
+    A single struct.Struct unpacks all columns of a row in one call and a
+    tuple of converters, one per column, turns the raw values into the
+    values returned by readlines(). Only the columns at indices are
+    unpacked, the struct skips over the others.
+    """
+    NUMBER_CONVERTERS = {
+        'number': _convert_number,
+        'datetime': _convert_datetime,
+        'time': _convert_time,
+        'date': _convert_date,
+    }
+
+    def __init__(self, parent, indices):
+        self.parent = parent
+        self.endian = '>' if parent.endianess == 'big' else '<'
+        self.indices = indices
+        self.names = tuple(
+            parent.columns[i].name.decode(parent.encoding,
+                                          parent.encoding_errors)
+            for i in indices
+        )
+        fields = []
+        kinds = []
+        for i in indices:
+            length = parent.column_data_lengths[i]
+            code, converter, kind = self._compile_column(parent.columns[i],
+                                                         length)
+            fields.append((parent.column_data_offsets[i], length, len(fields),
+                           code, converter))
+            kinds.append(kind)
+        self.converters = tuple(x[4] for x in fields)
+        # One of 'string', 'int', 'number', 'date', 'datetime' or 'time'
+        # per column
+        self.kinds = tuple(kinds)
+        # One struct per column, for decoding single cells
+        self.column_structs = [
+            (offset, struct.Struct(str(self.endian + code)))
+            for offset, _, _, code, _ in fields
+        ]
+        self.positions = {}
+        for i, name in enumerate(self.names):
+            self.positions.setdefault(name, i)
+        # Lay the columns out in offset order, padding over the gaps
+        fmt = [self.endian]
+        end = 0
+        order = []
+        for offset, length, i, code, _ in sorted(fields):
+            if offset < end:
+                break
+            if offset > end:
+                fmt.append('%dx' % (offset - end))
+            fmt.append(code)
+            order.append(i)
+            end = offset + length
+        if len(order) == len(fields):
+            self.struct = struct.Struct(str(''.join(fmt)))
+            self.order = [order.index(i) for i in xrange(len(fields))]
+            if self.order == sorted(self.order):
+                self.order = None
+            # The same layout padded to a whole row, for unpacking runs of
+            # rows in one go
+            row_length = parent.properties.row_length or 0
+            if self.struct.size <= row_length:
+                fmt.append('%dx' % (row_length - end))
+                self.row_struct = struct.Struct(str(''.join(fmt)))
+            else:
+                self.row_struct = None
+        else:
+            # Overlapping columns, unpack each column on its own
+            self.struct = None
+            self.row_struct = None
+            self.order = None
+
+    def _compile_column(self, column, length):
+        """
+        Returns the struct code, converter and kind of a column, matching
+        what SAS7BDAT._read_val() does for it.
+        """
+        parent = self.parent
+        fmt = parent._column_kind(column, length)
+        if fmt == 'string':
+            return '%ds' % length, StringDecoder(parent).decode, 'string'
+        if fmt == 'int':
+            fmt = 'h'
+        if fmt == 'h' and length == 2:
+            return 'h', _identity, 'int'
+        elif fmt == 'h' or length > 8:
+            # Let _read_val deal with these, they shouldn't happen
+            def convert_raw(val):
+                return parent._read_val(fmt, val, length)
+            return '%ds' % length, convert_raw, 'int' if fmt == 'h' else fmt
+        converter = self.NUMBER_CONVERTERS[fmt]
+        if fmt == 'date':
+            _fill_date_table()
+        if length == 8:
+            return 'd', converter, fmt
+        # Truncated numbers hold the most significant bytes of a double
+        padding = b'\x00' * (8 - length)
+        unpack = struct.Struct(str(self.endian + 'd')).unpack
+        if self.endian == '<':
+            def convert_truncated(val):
+                return converter(unpack(padding + val)[0])
+        else:
+            def convert_truncated(val):
+                return converter(unpack(val + padding)[0])
+        return '%ds' % length, convert_truncated, fmt
+
+    def decode(self, source, offset):
+        """
+        Decodes the row starting at offset in source.
+        """
+        if self.struct is None:
+            values = [x[1].unpack_from(source, offset + x[0])[0]
+                      for x in self.column_structs]
+        elif len(source) - offset < self.struct.size:
+            return self.decode_truncated(source, offset)
+        else:
+            values = self.struct.unpack_from(source, offset)
+            if self.order is not None:
+                values = [values[i] for i in self.order]
+        return [f(v) for f, v in zip(self.converters, values)]
+
+    def decode_cell(self, source, offset, i):
+        """
+        Decodes the value of the i-th column of the row starting at offset
+        in source.
+        """
+        cell_offset, cell_struct = self.column_structs[i]
+        start = offset + cell_offset
+        if len(source) - start < cell_struct.size:
+            return self.decode_truncated(source, offset)[i]
+        return self.converters[i](cell_struct.unpack_from(source, start)[0])
+
+    def decode_columns(self, blocks):
+        """
+        Decodes a list of (source, offset, count) row blocks into one list
+        of values per column.
+        """
+        row_length = self.parent.properties.row_length
+        row_struct = self.row_struct
+        raw = []
+        for source, offset, count in blocks:
+            end = offset + count * row_length
+            if row_struct is None or len(source) < end:
+                rows = [self.decode(source, offset + i * row_length)
+                        for source, offset, count in blocks
+                        for i in xrange(count)]
+                return [list(x) for x in zip(*rows)] if rows else\
+                    [[] for _ in self.converters]
+            if hasattr(row_struct, 'iter_unpack'):
+                raw.extend(row_struct.iter_unpack(
+                    memoryview(source)[offset:end]
+                ))
+            else:
+                raw.extend(row_struct.unpack_from(source, x)
+                           for x in xrange(offset, end, row_length))
+        if not raw:
+            return [[] for _ in self.converters]
+        columns = list(zip(*raw))
+        if self.order is not None:
+            columns = [columns[i] for i in self.order]
+        return [list(c) if f is _identity else list(map(f, c))
+                for f, c in zip(self.converters, columns)]
+
+    def decode_truncated(self, source, offset):
+        """
+        Decodes a row that runs past the end of source the way it always
+        has been: each column gets whatever bytes are left.
+        """
+        parent = self.parent
+        row_elements = []
+        for i in self.indices:
+            length = parent.column_data_lengths[i]
+            start = offset + parent.column_data_offsets[i]
+            temp = source[start:start + length]
+            kind = parent._column_kind(parent.columns[i], length)
+            if kind == 'string':
+                row_elements.append(parent._read_val(
+                    's', temp, length
+                ).decode(parent.encoding, parent.encoding_errors))
+            elif kind == 'int':
+                row_elements.append(parent._read_val('h', temp, length))
+            else:
+                row_elements.append(parent._read_val(kind, temp, length))
+        return row_elements
+
+
+class NumpyDecoder(object):
+    """
+    Decodes runs of rows at once by viewing them as a NumPy structured
+    array whose dtype is built from the column offsets, lengths and the
+    file's endianness. Each column then comes out as a typed array. Only
+    the columns at indices are part of the dtype.
+    """
+    def __init__(self, parent, indices):
+        import numpy as np
+        self.np = np
+        self.parent = parent
+        self.indices = indices
+        endian = '>' if parent.endianess == 'big' else '<'
+        self.endian = endian
+        names = []
+        formats = []
+        offsets = []
+        self.fields = []
+        for i in indices:
+            length = parent.column_data_lengths[i]
+            column = parent.columns[i]
+            kind = parent._column_kind(column, length)
+            if kind == 'string':
+                fmt = 'S%d' % length
+            elif kind == 'int':
+                fmt = '%si%d' % (endian, length)
+            elif length > 8:
+                raise ParseError('unsupported length %s for numeric column '
+                                 '%s' % (length, column.name))
+            elif length == 8:
+                fmt = '%sf8' % endian
+            else:
+                fmt = ('u1', (length,))
+            field = 'f%d' % len(names)
+            names.append(field)
+            formats.append(fmt)
+            offsets.append(parent.column_data_offsets[i])
+            self.fields.append((
+                field,
+                column.name.decode(parent.encoding, parent.encoding_errors),
+                kind,
+                length
+            ))
+        self.date_table = None
+        self.string_decoders = dict(
+            (field, StringDecoder(parent))
+            for field, _, kind, _ in self.fields if kind == 'string'
+        )
+        self.dtype = np.dtype({
+            'names': names,
+            'formats': formats,
+            'offsets': offsets,
+            'itemsize': parent.properties.row_length or 0,
+        })
+
+    def decode(self, blocks, temporal='object', strings='object',
+               shared=True):
+        """
+        Decodes a list of (source, offset, count) row blocks into an
+        OrderedDict of column name to array. See SAS7BDAT.read_columns()
+        for temporal and strings, and StringDecoder.encode_array() for
+        shared.
+        """
+        np = self.np
+        row_length = self.dtype.itemsize
+        records = []
+        for source, offset, count in blocks:
+            whole = count
+            if row_length:
+                whole = min(count, max(len(source) - offset, 0) // row_length)
+            if whole:
+                records.append(np.frombuffer(source, self.dtype, whole,
+                                             offset))
+            if whole < count:
+                rows = b''.join(
+                    self.pad_truncated(source, offset + i * row_length)
+                    for i in xrange(whole, count)
+                )
+                records.append(np.frombuffer(rows, self.dtype))
+        if not records:
+            records = [np.zeros(0, self.dtype)]
+        columns = collections.OrderedDict()
+        for field, name, kind, length in self.fields:
+            if len(records) == 1:
+                raw = records[0][field]
+            else:
+                raw = np.concatenate([x[field] for x in records])
+            if kind != 'string':
+                columns[name] = self.convert(raw, kind, length, temporal)
+            elif strings == 'dictionary':
+                columns[name] = self.string_decoders[field].encode_array(
+                    raw, shared
+                )
+            else:
+                columns[name] = self.string_decoders[field].decode_array(raw)
+        return columns
+
+    def pad_truncated(self, source, offset):
+        """
+        Returns the row at offset in source, which runs past the end of
+        source, padded to a whole row so that each column decodes to what
+        RowDecoder.decode_truncated() gives for it. The bytes left of a
+        number are its most significant ones, those of a string are
+        followed by NULs.
+        """
+        row = bytearray(self.dtype.itemsize)
+        for field, _, kind, length in self.fields:
+            column_offset = self.dtype.fields[field][1]
+            start = offset + column_offset
+            data = bytes(source[start:start + length])
+            if kind != 'string' and self.endian == '<':
+                column_offset += length - len(data)
+            row[column_offset:column_offset + len(data)] = data
+        return bytes(row)
+
+    def convert(self, raw, kind, length, temporal='object'):
+        np = self.np
+        if kind == 'int':
+            return raw.astype(np.int64)
+        if length < 8:
+            # Truncated numbers hold the most significant bytes of a double
+            padded = np.zeros((len(raw), 8), dtype=np.uint8)
+            if self.endian == '<':
+                padded[:, 8 - length:] = raw
+            else:
+                padded[:, :length] = raw
+            raw = padded.view('%sf8' % self.endian).ravel()
+        values = raw.astype(np.float64)
+        if kind == 'number':
+            return values
+        if temporal == 'datetime64':
+            return self.convert_temporal(values, kind)
+        if kind == 'date':
+            return self.convert_dates(values)
+        converter = RowDecoder.NUMBER_CONVERTERS[kind]
+        return np.array([None if x != x else converter(x)
+                         for x in values.tolist()], dtype=object)
+
+    def convert_dates(self, values):
+        """
+        Converts SAS day numbers to an object array of datetime.date by
+        looking them up in the date table as a whole. Only the days outside
+        of the table are converted one by one.
+        """
+        np = self.np
+        _fill_date_table()
+        table = self.date_table
+        if table is None:
+            table = self.date_table = np.array(_DATE_TABLE + [None],
+                                               dtype=object)
+        missing = np.isnan(values)
+        days = np.where(missing, 0, values)
+        in_table = ~missing & (days == np.floor(days)) &\
+            (days >= _DATE_TABLE_START) & (days < _DATE_TABLE_STOP)
+        index = np.where(in_table, days - _DATE_TABLE_START, len(table) - 1)
+        result = table[index.astype(np.int64)]
+        for i in np.flatnonzero(~in_table & ~missing).tolist():
+            result[i] = _convert_date(values[i])
+        return result
+
+    def convert_temporal(self, values, kind):
+        """
+        Converts SAS dates, datetimes and times to datetime64[D],
+        datetime64[ms] and timedelta64[ms] arrays respectively, with NaT
+        for missing values, by adding the column to the SAS epoch.
+        """
+        np = self.np
+        missing = ~np.isfinite(values)
+        if kind == 'date':
+            unit = 'D'
+            ticks = np.floor(values)
+        else:
+            unit = 'ms'
+            ticks = np.round(values * 1000)
+        ticks = np.where(missing, 0, ticks).astype(np.int64)
+        if kind == 'time':
+            result = ticks.astype('m8[%s]' % unit)
+            result[missing] = np.timedelta64('NaT')
+        else:
+            result = np.datetime64(SAS_EPOCH.date(), unit) +\
+                ticks.astype('m8[%s]' % unit)
+            result[missing] = np.datetime64('NaT')
+        return result
+
+
+def _is_in(val, values):
+    return val in values
+
+
+def _is_not_in(val, values):
+    return val not in values
+
+
+class RowFilter(object):
+    """
+    A where= filter: a list of (column, operator, value) conditions that
+    must all hold for a row to be kept. Only the columns named in the
+    conditions are decoded, from the raw row bytes, so rows that fail are
+    never decoded in full. Missing numeric values match no condition.
+    """
+    OPERATORS = {
+        '==': operator.eq,
+        '!=': operator.ne,
+        '<': operator.lt,
+        '<=': operator.le,
+        '>': operator.gt,
+        '>=': operator.ge,
+        'in': _is_in,
+        'not in': _is_not_in,
+    }
+
+    def __init__(self, parent, where):
+        self.parent = parent
+        if isinstance(where, tuple):
+            where = [where]
+        columns = []
+        conditions = []
+        for condition in where:
+            try:
+                column, op, value = condition
+            except (TypeError, ValueError):
+                raise ValueError('expected a (column, operator, value) '
+                                 'condition, got %r' % (condition,))
+            test = self.OPERATORS.get(op)
+            if test is None:
+                raise ValueError('unknown operator %r, expected one of %s' %
+                                 (op, ', '.join(sorted(self.OPERATORS))))
+            if test in (_is_in, _is_not_in):
+                try:
+                    value = frozenset(value)
+                except TypeError:
+                    value = tuple(value)
+            if column not in columns:
+                columns.append(column)
+            conditions.append((columns.index(column), test, value))
+        self.decoder = parent._get_row_decoder(columns)
+        self.conditions = [
+            (i, test, value,
+             parent.columns[self.decoder.indices[i]].type == 'number')
+            for i, test, value in conditions
+        ]
+
+    def matches_values(self, values):
+        for i, test, value, numeric in self.conditions:
+            val = values[i]
+            if numeric and val == '':
+                return False
+            if not test(val, value):
+                return False
+        return True
+
+    def matches(self, source, offset):
+        """
+        Returns whether the row starting at offset in source matches.
+        """
+        return self.matches_values(self.decoder.decode(source, offset))
+
+    def filter_blocks(self, blocks):
+        """
+        Yields (source, offset, count) for the runs of matching rows in an
+        iterable of (source, offset, count) row blocks.
+        """
+        row_length = self.parent.properties.row_length
+        matches_values = self.matches_values
+        for source, offset, count in blocks:
+            columns = self.decoder.decode_columns([(source, offset, count)])
+            start = offset
+            run = 0
+            for i, values in enumerate(zip(*columns)):
+                if matches_values(values):
+                    if not run:
+                        start = offset + i * row_length
+                    run += 1
+                elif run:
+                    yield source, start, run
+                    run = 0
+            if run:
+                yield source, start, run
+
+
+class RowView(object):
+    """
+    A row that is only decoded a cell at a time, when indexed by column
+    position or name. It holds on to the buffer the row was read from, so
+    it stays valid after reading moves on, as long as the file is open.
+    """
+    __slots__ = ('decoder', 'source', 'offset')
+
+    def __init__(self, decoder, source, offset):
+        self.decoder = decoder
+        self.source = source
+        self.offset = offset
+
+    def __len__(self):
+        return len(self.decoder.converters)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return [self[i] for i in xrange(*key.indices(len(self)))]
+        if not isinstance(key, six.integer_types):
+            try:
+                key = self.decoder.positions[key]
+            except KeyError:
+                raise KeyError('unknown column: %s' % (key,))
+        elif key < 0:
+            key += len(self)
+        if not 0 <= key < len(self):
+            raise IndexError('column index out of range')
+        return self.decoder.decode_cell(self.source, self.offset, key)
+
+    def __iter__(self):
+        for i in xrange(len(self)):
+            yield self[i]
+
+    def __eq__(self, other):
+        if not isinstance(other, (list, tuple, RowView)):
+            return NotImplemented
+        return self.to_list() == list(other)
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        if equal is NotImplemented:
+            return equal
+        return not equal
+
+    def __repr__(self):
+        return 'RowView(%r)' % (self.to_list(),)
+
+    def to_list(self):
+        """
+        to_list() -> list of all the values in the row
+        """
+        return self.decoder.decode(self.source, self.offset)
+
+
+class DictionaryColumn(object):
+    """
+    A dictionary encoded string column: codes is an int32 array of indices
+    into categories, an object array of the distinct values.
+    """
+    def __init__(self, codes, categories):
+        self.codes = codes
+        self.categories = categories
+
+    def __len__(self):
+        return len(self.codes)
+
+    def __getitem__(self, i):
+        return self.categories[self.codes[i]]
+
+    def __iter__(self):
+        return iter(self.categories[self.codes])
+
+    def __array__(self, dtype=None, copy=None):
+        values = self.categories[self.codes]
+        if dtype is not None:
+            values = values.astype(dtype)
+        return values
+
+    def __repr__(self):
+        return 'DictionaryColumn(%s values, %s categories)' % (
+            len(self.codes), len(self.categories)
+        )
+
+    def to_categorical(self):
+        """
+        to_categorical() -> pandas.Categorical
+        """
+        import pandas as pd
+        return pd.Categorical.from_codes(self.codes, self.categories)
+
+    @classmethod
+    def concatenate(cls, columns):
+        """
+        Joins DictionaryColumns from the same decoder. The categories of
+        the last one hold those of all the others.
+        """
+        import numpy as np
+        return cls(np.concatenate([x.codes for x in columns]),
+                   columns[-1].categories)
+
+
+class ColumnBatch(object):
+    """
+    A batch of rows stored column by column. columns maps each column name
+    to an array or list of values and row_count is the number of rows.
+    """
+    def __init__(self, columns, row_count):
+        self.columns = columns
+        self.row_count = row_count
+
+    def __len__(self):
+        return self.row_count
+
+    def __getitem__(self, name):
+        return self.columns[name]
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __repr__(self):
+        return 'ColumnBatch(%s rows: %s)' % (self.row_count,
+                                             ', '.join(self.columns))
+
+
+class ArrowConverter(object):
+    """
+    Turns the columns of runs of rows, decoded by a NumpyDecoder, into
+    pyarrow RecordBatches. The schema follows the column types and
+    formats: 2 byte integers are int64, other numbers float64, dates
+    date32, datetimes timestamp[ms], times time64[us] and strings
+    dictionary<int32, string>. Missing numbers, dates, datetimes and times
+    are nulls. Each field keeps the label and format of its column as
+    metadata. The dictionary of a string column only holds the values in
+    its batch.
+    """
+    def __init__(self, parent, indices):
+        import pyarrow as pa
+        self.pa = pa
+        # A decoder of its own, so the strings decoded by one export don't
+        # carry over to the next
+        self.decoder = NumpyDecoder(parent, indices)
+        types = {
+            'int': pa.int64(),
+            'number': pa.float64(),
+            'date': pa.date32(),
+            'datetime': pa.timestamp('ms'),
+            'time': pa.time64('us'),
+            'string': pa.dictionary(pa.int32(), pa.string()),
+        }
+        fields = []
+        for i, (_, name, kind, _) in zip(indices, self.decoder.fields):
+            column = parent.columns[i]
+            fields.append(pa.field(name, types[kind], metadata={
+                b'label': column.label.decode(
+                    parent.encoding, parent.encoding_errors
+                ).encode('utf8'),
+                b'format': column.format.encode('utf8'),
+            }))
+        self.schema = pa.schema(fields)
+
+    def convert(self, blocks):
+        """
+        Converts a list of (source, offset, count) row blocks into a
+        RecordBatch.
+        """
+        pa = self.pa
+        np = self.decoder.np
+        columns = self.decoder.decode(blocks, 'datetime64', 'dictionary',
+                                      shared=False)
+        arrays = []
+        for (_, _, kind, _), values in zip(self.decoder.fields,
+                                           columns.values()):
+            if kind == 'string':
+                arrays.append(pa.DictionaryArray.from_arrays(
+                    values.codes, pa.array(values.categories, pa.string())
+                ))
+            elif kind == 'time':
+                arrays.append(pa.array(
+                    values.astype('m8[us]').view(np.int64), pa.time64('us'),
+                    mask=np.isnat(values)
+                ))
+            else:
+                arrays.append(pa.array(values, from_pandas=True))
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+
+def _format_values(values):
+    """
+    Returns the values as str() writes them, keeping all the digits of
+    floats on Python 2 as well.
+    """
+    if six.PY3:
+        return list(map(str, values))
+    return [repr(x) if isinstance(x, float) else six.text_type(x)
+            for x in values]
+
+
+class CSVFormatter(object):
+    """
+    Formats batches of decoded columns as delimited text, a column at a
+    time. Values are written the way csv.writer writes them, quoted
+    following one of the csv.QUOTE_* policies. When float_format is given,
+    numbers (but not dates, times or 2 byte integers) are formatted with
+    float_format % value instead.
+    """
+    QUOTING = (csv.QUOTE_MINIMAL, csv.QUOTE_ALL, csv.QUOTE_NONNUMERIC,
+               csv.QUOTE_NONE)
+
+    def __init__(self, kinds, delimiter=',', quoting=csv.QUOTE_MINIMAL,
+                 float_format=None, lineterminator='\n'):
+        if quoting not in self.QUOTING:
+            raise ValueError('unknown quoting %r, expected one of the '
+                             'csv.QUOTE_* constants' % (quoting,))
+        if len(delimiter) != 1:
+            raise ValueError('delimiter must be a single character: %r' %
+                             delimiter)
+        self.kinds = kinds
+        self.delimiter = delimiter
+        self.quoting = quoting
+        self.float_format = float_format
+        self.lineterminator = lineterminator
+        self.special = (delimiter, '"', '\r', '\n')
+
+    def _quote_all(self, values):
+        return ['"%s"' % x.replace('"', '""') for x in values]
+
+    def _quote_minimal(self, values):
+        joined = '\x00'.join(values)
+        if not any(x in joined for x in self.special):
+            return values
+        special = self.special
+        return ['"%s"' % x.replace('"', '""')
+                if any(c in x for c in special) else x for x in values]
+
+    def _check_unquoted(self, values):
+        joined = '\x00'.join(values)
+        if any(x in joined for x in self.special):
+            for x in values:
+                if any(c in x for c in self.special):
+                    raise ValueError('cannot write %r without quoting' % x)
+        return values
+
+    def format_column(self, values, kind):
+        """
+        format_column(values, kind) -> list of strings
+
+        Formats the values of one column of the given kind (see
+        RowDecoder.kinds) as quoted text fields.
+        """
+        quoting = self.quoting
+        if kind == 'string':
+            if quoting == csv.QUOTE_MINIMAL:
+                return self._quote_minimal(values)
+            elif quoting == csv.QUOTE_NONE:
+                return self._check_unquoted(values)
+            return self._quote_all(values)
+        if kind == 'number' and self.float_format is not None:
+            float_format = self.float_format
+            fields = [float_format % x if x != '' else '' for x in values]
+        else:
+            fields = _format_values(values)
+        if quoting == csv.QUOTE_MINIMAL:
+            return self._quote_minimal(fields)
+        elif quoting == csv.QUOTE_NONE:
+            return self._check_unquoted(fields)
+        elif quoting == csv.QUOTE_ALL or kind not in ('int', 'number'):
+            return self._quote_all(fields)
+        # Only missing numbers are not numeric
+        return ['""' if x == '' else x for x in self._quote_minimal(fields)]
+
+    def format_row(self, values):
+        """
+        format_row(values) -> str
+
+        Formats a row of strings, such as the column names, as one line.
+        """
+        fields = [self.format_column([x], 'string')[0] for x in values]
+        if fields == ['']:
+            fields = ['""']
+        return self.delimiter.join(fields) + self.lineterminator
+
+    def format_columns(self, columns):
+        """
+        format_columns(columns) -> str
+
+        Formats a list of columns, each a list of values, as lines of text.
+        """
+        if not columns or not columns[0]:
+            return ''
+        fields = [self.format_column(values, kind)
+                  for values, kind in zip(columns, self.kinds)]
+        if len(fields) == 1:
+            # A lone empty field would read back as a blank line
+            lines = ['""' if x == '' else x for x in fields[0]]
+        else:
+            lines = [self.delimiter.join(x) for x in zip(*fields)]
+        lines.append('')
+        return self.lineterminator.join(lines)
+
+
+class JSONLinesFormatter(object):
+    """
+    Formats batches of decoded columns as JSON Lines, one object per row
+    mapping the column names to the values, a column at a time. The keys
+    are escaped once up front. Strings are escaped with the json module's
+    encoder, dates, datetimes and times written as ISO 8601 strings and
+    missing values as null. When float_format is given, numbers (but not
+    2 byte integers) are formatted with float_format % value.
+    """
+    def __init__(self, names, kinds, float_format=None,
+                 lineterminator='\n'):
+        self.keys = [json.encoder.encode_basestring(x) + ':' for x in names]
+        self.kinds = kinds
+        self.float_format = float_format
+        self.lineterminator = lineterminator
+
+    def format_column(self, values, kind):
+        """
+        format_column(values, kind) -> list of strings
+
+        Formats the values of one column of the given kind (see
+        RowDecoder.kinds) as JSON values.
+        """
+        if kind == 'string':
+            encode = json.encoder.encode_basestring
+            return [encode(x) for x in values]
+        elif kind in ('int', 'number'):
+            if kind == 'number' and self.float_format is not None:
+                float_format = self.float_format
+                return ['null' if x == '' else float_format % x
+                        for x in values]
+            return ['null' if x == '' else x
+                    for x in _format_values(values)]
+        return ['null' if x == '' else '"%s"' % x.isoformat()
+                for x in values]
+
+    def format_columns(self, columns):
+        """
+        format_columns(columns) -> str
+
+        Formats a list of columns, each a list of values, as lines of JSON
+        objects.
+        """
+        if not columns or not columns[0]:
+            return ''
+        fields = []
+        for key, values, kind in zip(self.keys, columns, self.kinds):
+            fields.append([key + x for x in self.format_column(values, kind)])
+        lines = ['{%s}' % ','.join(x) for x in zip(*fields)]
+        lines.append('')
+        return self.lineterminator.join(lines)
+
+
+class PageReader(object):
+    """
+    Reads pages sequentially from the open sas7bdat file
+    """
+    def __init__(self, parent):
+        self.parent = parent
+
+    def seek(self, offset):
+        self.parent._file.seek(offset)
+
+    def tell(self):
+        return self.parent._file.tell()
+
+    def read_page(self):
+        return self.parent._file.read(self.parent.properties.page_length)
+
+    def read_at(self, offset, length):
+        f = self.parent._file
+        position = f.tell()
+        f.seek(offset)
+        data = f.read(length)
+        f.seek(position)
+        return data
+
+    def close(self):
+        pass
+
+
+class MMapPageReader(PageReader):
+    """
+    Memory-maps the whole file and returns pages as memoryview windows
+    onto the mapping, so reading a page never copies it
+    """
+    def __init__(self, parent):
+        super(MMapPageReader, self).__init__(parent)
+        self._mmap = mmap.mmap(parent._file.fileno(), 0,
+                               access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self.position = parent._file.tell()
+
+    def seek(self, offset):
+        self.position = offset
+
+    def tell(self):
+        return self.position
+
+    def read_page(self):
+        start = self.position
+        end = min(start + self.parent.properties.page_length,
+                  len(self._view))
+        self.position = max(start, end)
+        return self._view[start:end]
+
+    def read_at(self, offset, length):
+        return self._view[offset:offset + length]
+
+    def close(self):
+        if self._mmap.closed:
+            return
+        self._view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Rows still hold views onto the mapping, it will be
+            # unmapped once they are garbage collected.
+            self.parent.logger.debug('mmap still in use, not closing')
+
+
+class PrefetchPageReader(PageReader):
+    """
+    Reads pages ahead of the decoder in a background thread, keeping up to
+    prefetch_pages of them in a bounded queue so that file I/O overlaps
+    with decoding
+    """
+    def __init__(self, parent, prefetch_pages):
+        super(PrefetchPageReader, self).__init__(parent)
+        self.prefetch_pages = prefetch_pages
+        # The thread gets its own file object, read_at() keeps using the
+        # parent's
+        self._file = open(parent.path, 'rb')
+        self._file.seek(parent._file.tell())
+        # Offset of the next page read_page() returns, the thread's file
+        # is ahead of it
+        self.position = parent._file.tell()
+        self._pages = None
+        self._stop = None
+        self._thread = None
+        self._eof = False
+
+    def _read_ahead(self, pages, stop):
+        page_length = self.parent.properties.page_length
+        while not stop.is_set():
+            try:
+                page = self._file.read(page_length)
+            except Exception as e:
+                page = e
+            while not stop.is_set():
+                try:
+                    pages.put(page, timeout=0.1)
+                    break
+                except queue.Full:
+                    pass
+            if not page or isinstance(page, Exception):
+                break
+
+    def _start(self):
+        self._pages = queue.Queue(self.prefetch_pages)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._read_ahead,
+                                        args=(self._pages, self._stop))
+        self._thread.daemon = True
+        self._thread.start()
+
+    def _halt(self):
+        if self._thread is not None:
+            self._stop.set()
+            # Make room so a blocked put() returns straight away
+            while not self._pages.empty():
+                self._pages.get_nowait()
+            self._thread.join()
+            self._thread = None
+
+    def seek(self, offset):
+        self._halt()
+        self._file.seek(offset)
+        self.position = offset
+        self._eof = False
+
+    def tell(self):
+        return self.position
+
+    def read_page(self):
+        if self._eof:
+            return b''
+        if self._thread is None:
+            self._start()
+        page = self._pages.get()
+        if isinstance(page, Exception):
+            self._eof = True
+            raise page
+        if not page:
+            self._eof = True
+        self.position += len(page)
+        return page
+
+    def close(self):
+        self._halt()
+        self._file.close()
 
 
 class SAS7BDAT(object):
@@ -368,6 +1404,51 @@ SAS7BDAT object
     If your sas7bdat file uses non-standard format strings for time, datetime,
     or date values, pass those strings into the constructor using the
     appropriate kwarg.
+
+    Pass mmap=True to memory-map the file instead of reading it page by
+    page. Pages are then exposed as memoryview windows onto the mapping,
+    which avoids a copy per page and lets processes reading the same file
+    share the operating system's page cache. On Python 2 the option is
+    ignored with a warning.
+
+    seek_row() and read_rows() jump straight to the page holding a row
+    using a page index. The index is built with a scan over the page
+    headers on first use, or loaded from the sidecar written by
+    save_page_index() (page_index_path, defaulting to the file path with
+    .idx appended).
+
+    Pass workers=N to decode the data pages in a pool of N processes. Rows
+    are still returned in file order.
+
+    Pass prefetch_pages=K to read up to K pages ahead in a background
+    thread while the current page is decoded. This hides most of the read
+    latency on network filesystems. It has no effect together with mmap.
+
+    The engine ('numpy' or 'python') picks how iter_batches() decodes
+    columns. It defaults to 'numpy' when NumPy is installed.
+
+    Pass a list of column names as columns to only read those columns, in
+    that order. The other columns are never unpacked or decoded. Most
+    reading methods also take a columns argument for a single call.
+
+    The temporal option sets how the 'numpy' engine returns dates, times
+    and datetimes: as Python objects ('object') or as NumPy datetime64 and
+    timedelta64 arrays ('datetime64').
+
+    Compressed files are decompressed again on every read. Pass a directory
+    as cache_dir to keep their rows decompressed on disk: the first open
+    writes them to the cache with transcode() and later opens of the same,
+    unchanged file read them from there through a memory map. The cache is
+    kept under cache_size bytes (10 GiB by default) by removing the least
+    recently used entries. Files with rows that decompress short are not
+    cached and are read directly instead, as are all files when the cache
+    cannot be written or read, or on Python 2.
+
+    String values are decoded once per distinct value and shared, for up
+    to string_cache_size distinct values per column. The strings option
+    sets whether the 'numpy' engine returns string columns as object
+    arrays ('object') or as DictionaryColumns of codes and categories
+    ('dictionary').
     """
     _open_files = []
     RLE_COMPRESSION = b'SASYZCRL'
@@ -388,6 +1469,44 @@ SAS7BDAT object
     DATE_FORMAT_STRINGS = set([
         'YYMMDD', 'MMDDYY', 'DDMMYY', 'DATE', 'JULIAN', 'MONYY'
     ])
+    ROWS_PER_WORKER_TASK = 50000
+    ENGINES = ('numpy', 'python')
+    TEMPORAL_TYPES = ('object', 'datetime64')
+    STRING_TYPES = ('object', 'dictionary')
+    ROW_CACHE_SIZE = 10 * 1024 ** 3
+    OUTPUT_FORMATS = ('csv', 'jsonl')
+    # The NumPy dtype of each kind of column in to_data_frame()
+    DATA_FRAME_DTYPES = {
+        'int': 'i8',
+        'number': 'f8',
+        'date': 'M8[s]',
+        'datetime': 'M8[ms]',
+        'time': 'm8[ms]',
+        'string': object,
+    }
+    # The SQLite column affinity of each kind of column in to_sqlite()
+    SQLITE_AFFINITIES = {
+        'int': 'INTEGER',
+        'number': 'REAL',
+        'date': 'TEXT',
+        'datetime': 'TEXT',
+        'time': 'TEXT',
+        'string': 'TEXT',
+    }
+    # Pragmas for loading with to_sqlite() as fast as possible, at the cost
+    # of a corrupt database if the machine crashes during the load
+    SQLITE_BULK_PRAGMAS = {
+        'journal_mode': 'OFF',
+        'synchronous': 'OFF',
+        'cache_size': -262144,
+    }
+    # The NumPy dtype of numbers, dates, datetimes and times in to_numpy()
+    NUMPY_DTYPES = {
+        'number': 'f8',
+        'date': 'M8[D]',
+        'datetime': 'M8[ms]',
+        'time': 'm8[ms]',
+    }
 
     def __init__(self, path, log_level=logging.INFO,
                  extra_time_format_strings=None,
@@ -396,12 +1515,44 @@ SAS7BDAT object
                  skip_header=False,
                  encoding='utf8',
                  encoding_errors='ignore',
-                 align_correction=True):
+                 align_correction=True,
+                 mmap=False,
+                 page_index_path=None,
+                 workers=None,
+                 prefetch_pages=0,
+                 engine=None,
+                 columns=None,
+                 temporal='object',
+                 strings='object',
+                 string_cache_size=4096,
+                 cache_dir=None,
+                 cache_size=None):
         """
         x.__init__(...) initializes x; see help(type(x)) for signature
         """
         if log_level == logging.DEBUG:
             sys.excepthook = _debug
+        # Keyword arguments needed to open the same file in a worker process
+        self._worker_options = {
+            'log_level': log_level,
+            'extra_time_format_strings': extra_time_format_strings,
+            'extra_date_time_format_strings': extra_date_time_format_strings,
+            'extra_date_format_strings': extra_date_format_strings,
+            'skip_header': True,
+            'encoding': encoding,
+            'encoding_errors': encoding_errors,
+            'align_correction': align_correction,
+            'mmap': mmap,
+            'page_index_path': page_index_path,
+            'prefetch_pages': prefetch_pages,
+            'engine': engine,
+            'columns': columns,
+            'temporal': temporal,
+            'strings': strings,
+            'string_cache_size': string_cache_size,
+            'cache_dir': cache_dir,
+            'cache_size': cache_size,
+        }
         self.path = path
         self.endianess = None
         self.u64 = False
@@ -419,6 +1570,17 @@ SAS7BDAT object
         self.encoding = encoding
         self.encoding_errors = encoding_errors
         self.align_correction = align_correction
+        self.mmap = mmap
+        if page_index_path is None:
+            page_index_path = '%s.idx' % self.path
+        self.page_index_path = page_index_path
+        self.page_index = None
+        self.workers = workers
+        self.prefetch_pages = prefetch_pages
+        self.engine = engine
+        self.temporal = temporal
+        self.strings = strings
+        self.string_cache_size = string_cache_size
         self._file = open(self.path, 'rb')
         self._open_files.append(self._file)
         self.cached_page = None
@@ -436,7 +1598,43 @@ SAS7BDAT object
         self.columns = []
         self.header = SASHeader(self)
         self.properties = self.header.properties
+        if self.mmap and six.PY2:
+            # Python 2 cannot make a memoryview of a mapping
+            self.logger.warning('mmap is not supported on Python 2, reading '
+                                'pages instead')
+            self.mmap = False
+        if self.mmap:
+            self._page_reader = MMapPageReader(self)
+        elif self.prefetch_pages:
+            self._page_reader = PrefetchPageReader(self, self.prefetch_pages)
+        else:
+            self._page_reader = PageReader(self)
         self.header.parse_metadata()
+        # None unless the columns option picks columns
+        self.selected_columns = None
+        if columns is not None:
+            self.selected_columns = self._column_indices(columns)
+        self._row_decoders = {}
+        self._numpy_decoders = {}
+        self._row_decoder = self._get_row_decoder()
+        # One decompressor is shared by all the rows of a compressed file
+        if self.properties.compression:
+            self._decompressor = self.DECOMPRESSORS[
+                self.properties.compression
+            ](self)
+        else:
+            self._decompressor = None
+        self._row_cache = None
+        if cache_dir is not None and self.properties.compression and\
+                six.PY2:
+            self.logger.warning('cache_dir is not supported on Python 2, '
+                                'reading rows directly')
+        elif cache_dir is not None and self.properties.compression:
+            if cache_size is None:
+                cache_size = self.ROW_CACHE_SIZE
+            row_cache = RowCache(cache_dir, cache_size)
+            if row_cache.open(self):
+                self._row_cache = row_cache
         self.logger.debug('\n%s', str(self.header))
         self._iter = self.readlines()
 
@@ -482,6 +1680,13 @@ SAS7BDAT object
         Some kinds of file objects (for example, opened by popen())
         may return an exit status upon closing.
         """
+        self.cached_page = None
+        page_reader = getattr(self, '_page_reader', None)
+        if page_reader is not None:
+            page_reader.close()
+        row_cache = getattr(self, '_row_cache', None)
+        if row_cache is not None:
+            row_cache.close()
         return self._file.close()
 
     def _make_logger(self, level=logging.INFO):
@@ -522,7 +1727,10 @@ SAS7BDAT object
                 result[offset] = tmp
         else:
             for offset, length in six.iteritems(offsets_to_lengths):
-                result[offset] = self.cached_page[offset:offset + length]
+                val = self.cached_page[offset:offset + length]
+                if isinstance(val, memoryview):
+                    val = val.tobytes()
+                result[offset] = val
         return result
 
     def _read_val(self, fmt, raw_bytes, size):
@@ -531,7 +1739,7 @@ SAS7BDAT object
         newfmt = fmt
         if fmt == 's':
             newfmt = '%ds' % min(size, len(raw_bytes))
-        elif fmt in set(['number', 'datetime', 'date', 'time']):
+        elif fmt in ('number', 'datetime', 'date', 'time'):
             newfmt = 'd'
             if len(raw_bytes) != size:
                 size = len(raw_bytes)
@@ -539,7 +1747,7 @@ SAS7BDAT object
                 if self.endianess == 'little':
                     raw_bytes = b''.join([b'\x00' * (8 - size), raw_bytes])
                 else:
-                    raw_bytes += b'\x00' * (8 - size)
+                    raw_bytes = b''.join([raw_bytes, b'\x00' * (8 - size)])
                 size = 8
         if self.endianess == 'big':
             newfmt = '>%s' % newfmt
@@ -551,115 +1759,615 @@ SAS7BDAT object
         elif math.isnan(val):
             val = ''
         elif fmt == 'datetime':
-            val = datetime(1960, 1, 1) + timedelta(seconds=val)
+            val = SAS_EPOCH + timedelta(seconds=val)
         elif fmt == 'time':
-            val = (datetime(1960, 1, 1) + timedelta(seconds=val)).time()
+            val = (SAS_EPOCH + timedelta(seconds=val)).time()
         elif fmt == 'date':
-            val = (datetime(1960, 1, 1) + timedelta(days=val)).date()
-        elif fmt in set(['number']):
+            val = (SAS_EPOCH + timedelta(days=val)).date()
+        elif fmt == 'number':
             i = int(val)
             if i == val:
                 val = i
         return val
 
-    def readlines(self):
+    def readlines(self, workers=None, columns=None, where=None, lazy=False):
         """
-        readlines() -> generator which yields lists of values, each a line
-        from the file.
+        readlines([workers[, columns[, where[, lazy]]]]) -> generator which
+        yields lists of values, each a line from the file.
 
         Possible values in the list are None, string, float, datetime.datetime,
         datetime.date, and datetime.time.
+
+        If workers is greater than one (defaults to the workers passed to the
+        constructor), ranges of pages are decoded in that many processes and
+        their rows are yielded back in file order.
+
+        If columns is given, only those columns are decoded, in that order.
+
+        If where is given, only rows matching it are yielded. It is a list of
+        (column, operator, value) conditions that must all hold, where
+        operator is one of ==, !=, <, <=, >, >=, in and not in, e.g.
+        [('site', 'in', ['US01', 'US02']), ('price', '>', 100)]. The columns
+        in the conditions are decoded first and the rest of a row is only
+        decoded when it matches. Missing numeric values match nothing.
+
+        If lazy is true, rows (but not the header) are yielded as RowView
+        objects, which only decode a value when it is looked up by column
+        position or name. Lazy rows are always read in this process.
         """
-        bit_offset = self.header.PAGE_BIT_OFFSET
-        subheader_pointer_length = self.header.SUBHEADER_POINTER_LENGTH
-        row_count = self.header.properties.row_count
-        current_row_in_file_index = 0
-        current_row_on_page_index = 0
+        if workers is None:
+            workers = self.workers
+        decoder = self._get_row_decoder(columns)
+        row_filter = self._get_row_filter(where)
         if not self.skip_header:
-            yield [x.name.decode(self.encoding, self.encoding_errors)
-                   for x in self.columns]
-        if not self.cached_page:
-            self._file.seek(self.properties.header_length)
-            self._read_next_page()
-        while current_row_in_file_index < row_count:
-            current_row_in_file_index += 1
+            if columns is None and self.selected_columns is None:
+                yield [x.name.decode(self.encoding, self.encoding_errors)
+                       for x in self.columns]
+            else:
+                yield list(decoder.names)
+        if workers and workers > 1 and not lazy:
+            rows = itertools.chain.from_iterable(
+                self._map_row_ranges(_read_rows_worker, workers,
+                                     decoder.indices, where)
+            )
+        else:
+            rows = self._iter_rows(decoder=decoder, row_filter=row_filter,
+                                   lazy=lazy)
+        for row in rows:
+            yield row
+
+    def seek_row(self, n, columns=None, where=None):
+        """
+        seek_row(n[, columns[, where]]) -> generator which yields lists of
+        values, starting at row n (zero based) and running to the end of the
+        file.
+
+        The page index is used to jump straight to the page holding row n,
+        so none of the pages before it are read or decoded.
+        """
+        if n < 0:
+            raise ValueError('row number must not be negative: %s' % n)
+        return self._iter_rows(n, decoder=self._get_row_decoder(columns),
+                               row_filter=self._get_row_filter(where))
+
+    def read_rows(self, start, stop, columns=None, where=None):
+        """
+        read_rows(start, stop[, columns[, where]]) -> list of rows start
+        through stop - 1
+
+        Like seek_row(), only the pages holding the requested rows are
+        read. With where, only the rows in that range matching it are
+        returned.
+        """
+        if start < 0 or stop < 0:
+            raise ValueError('row numbers must not be negative: %s, %s' %
+                             (start, stop))
+        return list(self._iter_rows(
+            start, stop, decoder=self._get_row_decoder(columns),
+            row_filter=self._get_row_filter(where)
+        ))
+
+    def _column_indices(self, columns=None):
+        """
+        Returns the indices of the given column names (or indices), or of
+        the columns selected in the constructor when columns is None.
+        Columns following a column of length 0 are never read.
+        """
+        available = []
+        for i in xrange(self.properties.column_count or 0):
+            if self.column_data_lengths[i] == 0:
+                break
+            available.append(i)
+        if columns is None:
+            if self.selected_columns is not None:
+                return self.selected_columns
+            return available
+        if isinstance(columns, (six.string_types, bytes)):
+            columns = [columns]
+        by_name = dict(
+            (self.columns[i].name.decode(self.encoding, self.encoding_errors),
+             i) for i in available
+        )
+        indices = []
+        unknown = []
+        for column in columns:
+            if isinstance(column, bytes):
+                column = column.decode(self.encoding, self.encoding_errors)
+            if isinstance(column, six.integer_types):
+                if 0 <= column < len(available):
+                    indices.append(column)
+                    continue
+            elif column in by_name:
+                indices.append(by_name[column])
+                continue
+            unknown.append(column)
+        if unknown:
+            raise ValueError('unknown column%s: %s' % (
+                '' if len(unknown) == 1 else 's',
+                ', '.join(str(x) for x in unknown)
+            ))
+        return indices
+
+    def _column_kind(self, column, length):
+        """
+        Returns how the values of a column of length bytes are decoded:
+        'string', 'int' (numbers of 2 bytes or less), or 'number', 'date',
+        'datetime' or 'time' depending on its format. Both the row and the
+        NumPy decoders go by it.
+        """
+        if column.type != 'number':
+            return 'string'
+        if length <= 2:
+            return 'int'
+        fmt = column.format
+        if not fmt:
+            return 'number'
+        elif fmt in self.TIME_FORMAT_STRINGS:
+            return 'time'
+        elif fmt in self.DATE_TIME_FORMAT_STRINGS:
+            return 'datetime'
+        elif fmt in self.DATE_FORMAT_STRINGS:
+            return 'date'
+        return 'number'
+
+    def _get_row_decoder(self, columns=None):
+        indices = tuple(self._column_indices(columns))
+        decoder = self._row_decoders.get(indices)
+        if decoder is None:
+            decoder = self._row_decoders[indices] = RowDecoder(self, indices)
+        return decoder
+
+    def _resolve_option(self, value, option):
+        """
+        Returns value, or the option of the same name passed to the
+        constructor when value is None, after checking it is one of the
+        allowed values.
+        """
+        if value is None:
+            value = getattr(self, option)
+        allowed = {
+            'temporal': self.TEMPORAL_TYPES,
+            'strings': self.STRING_TYPES,
+        }[option]
+        if value not in allowed:
+            raise ValueError('unknown %s type %r, expected one of %s' %
+                             (option, value, ', '.join(allowed)))
+        return value
+
+    def _get_row_filter(self, where):
+        if not where:
+            return None
+        return RowFilter(self, where)
+
+    def _get_numpy_decoder(self, columns=None):
+        indices = tuple(self._column_indices(columns))
+        decoder = self._numpy_decoders.get(indices)
+        if decoder is None:
+            decoder = self._numpy_decoders[indices] =\
+                NumpyDecoder(self, indices)
+        return decoder
+
+    def build_page_index(self):
+        """
+        build_page_index() -> PageIndex
+
+        Scan the page headers of the file and record where its rows live.
+        The index is kept on the object and used by seek_row() and
+        read_rows().
+        """
+        self.page_index = PageIndex.build(self)
+        return self.page_index
+
+    def save_page_index(self, path=None):
+        """
+        save_page_index([path]) -> None
+
+        Save the page index as a sidecar file, building it first if needed.
+        Defaults to the path of the sas7bdat file with an .idx extension
+        appended. Later instances pick the sidecar up automatically.
+        """
+        if path is None:
+            path = self.page_index_path
+        self._get_page_index().save(path)
+
+    def load_page_index(self, path=None):
+        """
+        load_page_index([path]) -> PageIndex or None
+
+        Load a page index saved by save_page_index(). Returns None (and
+        keeps the current index) when the sidecar is missing, cannot be
+        read or was written for a different version of the file.
+        """
+        if path is None:
+            path = self.page_index_path
+        if not os.path.exists(path):
+            return None
+        try:
+            index = PageIndex.load(path)
+        except (ParseError, ValueError, KeyError, TypeError) as e:
+            self.logger.warning('ignoring unreadable page index %s: %s',
+                                path, e)
+            return None
+        if not index.matches(self):
+            self.logger.warning('ignoring out of date page index %s', path)
+            return None
+        self.page_index = index
+        return index
+
+    def _get_page_index(self):
+        if self.page_index is None and self.load_page_index() is None:
+            self.build_page_index()
+        return self.page_index
+
+    def _row_ranges(self, rows_per_range):
+        """
+        Splits the rows of the file into (start, stop) ranges of about
+        rows_per_range rows, aligned on page boundaries.
+        """
+        if self._row_cache is not None:
+            row_count = self._row_cache.row_count
+            for start in xrange(0, row_count, rows_per_range):
+                yield start, min(start + rows_per_range, row_count)
+            return
+        start = stop = 0
+        for entry in self._get_page_index().entries:
+            stop = entry.first_row + entry.row_count
+            if stop - start >= rows_per_range:
+                yield start, stop
+                start = stop
+        if stop > start:
+            yield start, stop
+
+    def _map_row_ranges(self, func, workers, *args):
+        """
+        Calls func(start, stop, *args) in a pool of worker processes, each
+        with its own SAS7BDAT instance, for every range of rows in the file.
+        Yields the results in file order while keeping at most two ranges
+        per worker in flight.
+        """
+        row_count = self.properties.row_count or 0
+        rows_per_range = max(
+            min(row_count // (workers * 4), self.ROWS_PER_WORKER_TASK), 1
+        )
+        ranges = self._row_ranges(rows_per_range)
+        if self._row_cache is None:
+            page_index = self._get_page_index()
+        else:
+            page_index = None
+        pool = multiprocessing.Pool(
+            workers, _init_worker,
+            (self.path, self._worker_options, page_index)
+        )
+        try:
+            pending = collections.deque()
+            for start, stop in itertools.islice(ranges, workers * 2):
+                pending.append(pool.apply_async(func, (start, stop) + args))
+            while pending:
+                result = pending.popleft().get()
+                for start, stop in itertools.islice(ranges, 1):
+                    pending.append(pool.apply_async(func,
+                                                    (start, stop) + args))
+                yield result
+            pool.close()
+        finally:
+            pool.terminate()
+            pool.join()
+
+    def _iter_pages(self, start=0, stop=None):
+        """
+        Reads the pages holding rows start through stop - 1. While each
+        page is the current page, yields the (offset, length) locations of
+        the wanted rows on it.
+
+        Each call keeps track of where its next page is, so that the
+        generators of readlines(), iter_batches() and the like can be open
+        at the same time, and mixed with seek_row() or read_rows(). Callers
+        must hold on to cached_page and current_page_type before yielding
+        themselves, as they change once another generator reads a page.
+        """
+        row_count = self.properties.row_count or 0
+        if stop is None or stop > row_count:
+            stop = row_count
+        if start:
+            page_index = self._get_page_index()
+            stop = min(stop, page_index.row_count)
+        if start >= stop:
+            return
+        if start:
+            entry = page_index.find_page(start)
+            self._page_reader.seek(entry.offset)
+            row_index = entry.first_row
+        else:
+            self._page_reader.seek(self.properties.header_length)
+            row_index = 0
+        self._read_next_page()
+        position = self._page_reader.tell()
+        while row_index < stop and self.cached_page:
+            locations = self._page_row_locations()
+            locations = locations[:row_count - row_index]
+            first = max(start - row_index, 0)
+            last = stop - row_index
+            if locations[first:last]:
+                yield locations[first:last]
+            row_index += len(locations)
+            if row_index < stop:
+                if self._page_reader.tell() != position:
+                    self._page_reader.seek(position)
+                self._read_next_page()
+                position = self._page_reader.tell()
+
+    def _iter_rows(self, start=0, stop=None, decoder=None, row_filter=None,
+                   lazy=False):
+        row_length = self.properties.row_length
+        if self._row_cache is not None:
+            for source, offset, count in self._iter_row_blocks(start, stop):
+                for row_offset in xrange(offset, offset + count * row_length,
+                                         row_length):
+                    row = self._decode_row(source, row_offset, decoder,
+                                           row_filter, lazy)
+                    if row is not None:
+                        self.current_row = row
+                        yield row
+            return
+        for locations in self._iter_pages(start, stop):
+            page = self.cached_page
             current_page_type = self.current_page_type
             if current_page_type == self.header.PAGE_META_TYPE:
-                try:
-                    current_subheader_pointer =\
-                        self.current_page_data_subheader_pointers[
-                            current_row_on_page_index
-                        ]
-                except IndexError:
-                    self._read_next_page()
-                    current_row_on_page_index = 0
-                else:
-                    current_row_on_page_index += 1
-                    cls = self.header.SUBHEADER_INDEX_TO_CLASS.get(
-                        self.header.DATA_SUBHEADER_INDEX
-                    )
-                    if cls is None:
-                        raise NotImplementedError
-                    cls(self).process_subheader(
-                        current_subheader_pointer.offset,
-                        current_subheader_pointer.length
-                    )
-                    if current_row_on_page_index ==\
-                            len(self.current_page_data_subheader_pointers):
-                        self._read_next_page()
-                        current_row_on_page_index = 0
+                for source, offset, count in self._iter_meta_page_blocks(
+                        page, locations):
+                    for row_offset in xrange(offset,
+                                             offset + count * row_length,
+                                             row_length):
+                        row = self._decode_row(source, row_offset, decoder,
+                                               row_filter, lazy)
+                        if row is not None:
+                            self.current_row = row
+                            yield row
             elif current_page_type in self.header.PAGE_MIX_TYPE:
-                if self.align_correction:
-                    align_correction = (
-                        bit_offset + self.header.SUBHEADER_POINTERS_OFFSET +
-                        self.current_page_subheaders_count *
-                        subheader_pointer_length
-                    ) % 8
-                else:
-                    align_correction = 0
-                offset = (
-                    bit_offset + self.header.SUBHEADER_POINTERS_OFFSET +
-                    align_correction + self.current_page_subheaders_count *
-                    subheader_pointer_length + current_row_on_page_index *
-                    self.properties.row_length
-                )
-                try:
-                    self.current_row = self._process_byte_array_with_data(
-                        offset,
-                        self.properties.row_length
-                    )
-                except:
-                    self.logger.exception(
-                        'failed to process data (you might want to try '
-                        'passing align_correction=%s to the SAS7BDAT '
-                        'constructor)' % (not self.align_correction)
+                for offset, length in locations:
+                    try:
+                        row = self._process_byte_array_with_data(
+                            offset, length, decoder, row_filter, lazy, page
+                        )
+                    except:
+                        self.logger.exception(
+                            'failed to process data (you might want to try '
+                            'passing align_correction=%s to the SAS7BDAT '
+                            'constructor)' % (not self.align_correction)
+                        )
+                        raise
+                    if row is not None:
+                        self.current_row = row
+                        yield row
+            else:
+                for offset, length in locations:
+                    row = self._process_byte_array_with_data(
+                        offset, length, decoder, row_filter, lazy, page
                     )
-                    raise
-                current_row_on_page_index += 1
-                if current_row_on_page_index == min(
-                    self.properties.row_count,
-                    self.properties.mix_page_row_count
-                ):
-                    self._read_next_page()
-                    current_row_on_page_index = 0
-            elif current_page_type == self.header.PAGE_DATA_TYPE:
-                self.current_row = self._process_byte_array_with_data(
-                    bit_offset + self.header.SUBHEADER_POINTERS_OFFSET +
-                    current_row_on_page_index *
-                    self.properties.row_length,
-                    self.properties.row_length
+                    if row is not None:
+                        self.current_row = row
+                        yield row
+
+    def _iter_row_blocks(self, start=0, stop=None):
+        """
+        Yields (source, offset, count) for runs of count rows stored back
+        to back from offset in source, covering rows start through
+        stop - 1. The rows of a meta page come from the buffer they are
+        decompressed into, or from the row cache when there is one.
+        """
+        if self._row_cache is not None:
+            row_count = self._row_cache.row_count
+            if stop is None or stop > row_count:
+                stop = row_count
+            for block in self._row_cache.iter_blocks(
+                    self.properties.row_length, start, stop):
+                yield block
+            return
+        for locations in self._iter_pages(start, stop):
+            page = self.cached_page
+            if self.current_page_type != self.header.PAGE_META_TYPE:
+                yield page, locations[0][0], len(locations)
+                continue
+            for block in self._iter_meta_page_blocks(page, locations):
+                yield block
+
+    def _iter_meta_page_blocks(self, page, locations):
+        """
+        Yields (source, offset, count) row blocks for the rows at the given
+        (offset, length) locations of the meta page page. The rows are
+        decompressed, or copied when stored uncompressed, into one buffer
+        for the page, so they come out as a single block. A row that comes
+        out short is yielded on its own, as a block that runs past the end
+        of its source, which both RowDecoder.decode_truncated() and
+        NumpyDecoder.pad_truncated() decode column by column.
+        """
+        row_length = self.properties.row_length
+        view = memoryview(page)
+        decompressor = self._decompressor
+        buf = bytearray(row_length * len(locations))
+        first = 0
+        for i, (offset, length) in enumerate(locations):
+            if decompressor is not None and length < row_length:
+                row = decompressor.decompress_row(offset, length, row_length,
+                                                  page)
+                short_source = row, 0
+            else:
+                row = view[offset:offset + row_length]
+                short_source = page, offset
+            if len(row) < row_length:
+                if i > first:
+                    yield buf, first * row_length, i - first
+                yield short_source + (1,)
+                first = i + 1
+                continue
+            buf[i * row_length:(i + 1) * row_length] =\
+                memoryview(row)[:row_length]
+        if len(locations) > first:
+            yield buf, first * row_length, len(locations) - first
+
+    def _iter_block_batches(self, start=0, stop=None, batch_size=65536,
+                            row_filter=None):
+        """
+        Groups the row blocks of rows start through stop - 1 into lists
+        holding batch_size rows each (the last one may be shorter). Rows not
+        matching row_filter are left out.
+        """
+        row_length = self.properties.row_length
+        blocks = []
+        rows = 0
+        row_blocks = self._iter_row_blocks(start, stop)
+        if row_filter is not None:
+            row_blocks = row_filter.filter_blocks(row_blocks)
+        for source, offset, count in row_blocks:
+            while rows + count >= batch_size:
+                take = batch_size - rows
+                blocks.append((source, offset, take))
+                yield blocks
+                blocks = []
+                rows = 0
+                offset += take * row_length
+                count -= take
+            if count:
+                blocks.append((source, offset, count))
+                rows += count
+        if blocks:
+            yield blocks
+
+    def iter_batches(self, batch_size=65536, engine=None, columns=None,
+                     where=None, temporal=None, strings=None):
+        """
+        iter_batches([batch_size[, engine[, columns[, where[, temporal[,
+        strings]]]]]]) -> generator which yields ColumnBatch objects
+
+        Reads the file column by column, batch_size rows at a time. Each
+        batch maps the column names to one array or list of values per
+        column.
+
+        With the 'numpy' engine (the default when NumPy is installed)
+        columns are NumPy arrays decoded a whole batch at a time, see
+        read_columns(). The 'python' engine returns lists holding the same
+        values as readlines(). If columns is given, only those columns are
+        decoded. With where (see readlines()), batches only hold the
+        matching rows. temporal and strings are passed on to the 'numpy'
+        engine, see read_columns().
+        """
+        if batch_size < 1:
+            raise ValueError('batch_size must be positive: %s' % batch_size)
+        row_filter = self._get_row_filter(where)
+        if self._resolve_engine(engine) == 'numpy':
+            decoder = self._get_numpy_decoder(columns)
+            temporal = self._resolve_option(temporal, 'temporal')
+            strings = self._resolve_option(strings, 'strings')
+            for blocks in self._iter_block_batches(batch_size=batch_size,
+                                                   row_filter=row_filter):
+                yield ColumnBatch(decoder.decode(blocks, temporal, strings),
+                                  sum(x[2] for x in blocks))
+        else:
+            decoder = self._get_row_decoder(columns)
+            for blocks in self._iter_block_batches(batch_size=batch_size,
+                                                   row_filter=row_filter):
+                yield ColumnBatch(
+                    collections.OrderedDict(
+                        zip(decoder.names, decoder.decode_columns(blocks))
+                    ),
+                    sum(x[2] for x in blocks)
+                )
+
+    def _resolve_engine(self, engine):
+        if engine is None:
+            engine = self.engine
+        if engine is None:
+            try:
+                import numpy  # noqa
+            except ImportError:
+                engine = 'python'
+            else:
+                engine = 'numpy'
+        if engine not in self.ENGINES:
+            raise ValueError('unknown engine %r, expected one of %s' %
+                             (engine, ', '.join(self.ENGINES)))
+        return engine
+
+    def read_columns(self, start=0, stop=None, columns=None, temporal=None,
+                     strings=None):
+        """
+        read_columns([start[, stop[, columns[, temporal[, strings]]]]]) ->
+        collections.OrderedDict mapping column names to NumPy arrays
+
+        Reads rows start through stop - 1 (defaults to all rows) column by
+        column. Runs of rows are viewed as a NumPy structured array built
+        from the column layout, so every column of a batch of pages is
+        converted at once instead of one cell at a time. Numbers come back
+        as float64 arrays with NaN for missing values, strings as object
+        arrays. If columns is given, only those columns are decoded.
+        Requires NumPy.
+
+        Dates, datetimes and times are object arrays of Python values (None
+        when missing) when temporal is 'object'. When temporal is
+        'datetime64' they are converted a whole column at a time to
+        datetime64[D], datetime64[ms] and timedelta64[ms] arrays with NaT
+        for missing values. Defaults to the temporal option passed to the
+        constructor.
+
+        String columns are object arrays when strings is 'object' and
+        DictionaryColumns, holding int32 codes into an array of distinct
+        values, when strings is 'dictionary'. Defaults to the strings option
+        passed to the constructor.
+        """
+        import numpy as np
+        decoder = self._get_numpy_decoder(columns)
+        temporal = self._resolve_option(temporal, 'temporal')
+        strings = self._resolve_option(strings, 'strings')
+        batches = [decoder.decode(x, temporal, strings)
+                   for x in self._iter_block_batches(start, stop)]
+        if not batches:
+            return decoder.decode([], temporal, strings)
+        if len(batches) == 1:
+            return batches[0]
+        columns = collections.OrderedDict()
+        for name, values in batches[0].items():
+            if isinstance(values, DictionaryColumn):
+                columns[name] = DictionaryColumn.concatenate(
+                    [x[name] for x in batches]
                 )
-                current_row_on_page_index += 1
-                if current_row_on_page_index == self.current_page_block_count:
-                    self._read_next_page()
-                    current_row_on_page_index = 0
             else:
-                self.logger.error('unknown page type: %s', current_page_type)
-            yield self.current_row
+                columns[name] = np.concatenate([x[name] for x in batches])
+        return columns
+
+    def _page_row_locations(self):
+        """
+        Returns (offset, length) pairs locating the rows stored on the
+        current page.
+        """
+        header = self.header
+        current_page_type = self.current_page_type
+        row_length = self.properties.row_length
+        if current_page_type == header.PAGE_META_TYPE:
+            return [(x.offset, x.length)
+                    for x in self.current_page_data_subheader_pointers]
+        elif current_page_type in header.PAGE_MIX_TYPE:
+            subheaders_length = (
+                header.PAGE_BIT_OFFSET + header.SUBHEADER_POINTERS_OFFSET +
+                self.current_page_subheaders_count *
+                header.SUBHEADER_POINTER_LENGTH
+            )
+            if self.align_correction:
+                align_correction = subheaders_length % 8
+            else:
+                align_correction = 0
+            offset = subheaders_length + align_correction
+            count = min(self.properties.row_count,
+                        self.properties.mix_page_row_count)
+        elif current_page_type == header.PAGE_DATA_TYPE:
+            offset = header.PAGE_BIT_OFFSET + header.SUBHEADER_POINTERS_OFFSET
+            count = self.current_page_block_count
+        else:
+            return []
+        return [(offset + i * row_length, row_length) for i in xrange(count)]
 
     def _read_next_page(self):
         self.current_page_data_subheader_pointers = []
-        self.cached_page = self._file.read(self.properties.page_length)
+        self.cached_page = self._page_reader.read_page()
         if len(self.cached_page) <= 0:
             return
 
@@ -670,75 +2378,120 @@ SAS7BDAT object
             )
         self.header.read_page_header()
         if self.current_page_type == self.header.PAGE_META_TYPE:
-            self.header.process_page_metadata()
+            self.header.process_page_metadata(data_only=True)
         if self.current_page_type not in [
             self.header.PAGE_META_TYPE,
             self.header.PAGE_DATA_TYPE
         ] + self.header.PAGE_MIX_TYPE:
             self._read_next_page()
 
-    def _process_byte_array_with_data(self, offset, length):
-        row_elements = []
-        if self.properties.compression and length < self.properties.row_length:
-            decompressor = self.DECOMPRESSORS.get(
-                self.properties.compression
-            )
-            source = decompressor(self).decompress_row(
-                offset, length, self.properties.row_length,
-                self.cached_page
+    def _process_byte_array_with_data(self, offset, length, decoder=None,
+                                      row_filter=None, lazy=False, page=None):
+        if page is None:
+            page = self.cached_page
+        if self._decompressor is not None and\
+                length < self.properties.row_length:
+            source = self._decompressor.decompress_row(
+                offset, length, self.properties.row_length, page
             )
             offset = 0
         else:
-            source = self.cached_page
-        for i in xrange(self.properties.column_count):
-            length = self.column_data_lengths[i]
-            if length == 0:
-                break
-            start = offset + self.column_data_offsets[i]
-            end = offset + self.column_data_offsets[i] + length
-            temp = source[start:end]
-            if self.columns[i].type == 'number':
-                if self.column_data_lengths[i] <= 2:
-                    row_elements.append(self._read_val(
-                        'h', temp, length
-                    ))
-                else:
-                    fmt = self.columns[i].format
-                    if not fmt:
-                        row_elements.append(self._read_val(
-                            'number', temp, length
-                        ))
-                    elif fmt in self.TIME_FORMAT_STRINGS:
-                        row_elements.append(self._read_val(
-                            'time', temp, length
-                        ))
-                    elif fmt in self.DATE_TIME_FORMAT_STRINGS:
-                        row_elements.append(self._read_val(
-                            'datetime', temp, length
-                        ))
-                    elif fmt in self.DATE_FORMAT_STRINGS:
-                        row_elements.append(self._read_val(
-                            'date', temp, length
-                        ))
-                    else:
-                        row_elements.append(self._read_val(
-                            'number', temp, length
-                        ))
-            else:  # string
-                row_elements.append(self._read_val(
-                    's', temp, length
-                ).decode(self.encoding, self.encoding_errors))
-        return row_elements
+            source = page
+        return self._decode_row(source, offset, decoder, row_filter, lazy)
+
+    def _decode_row(self, source, offset, decoder=None, row_filter=None,
+                    lazy=False):
+        """
+        Decodes the row starting at offset in source, or returns None if
+        it doesn't match row_filter.
+        """
+        if row_filter is not None and not row_filter.matches(source, offset):
+            return None
+        if decoder is None:
+            decoder = self._row_decoder
+        if lazy:
+            return RowView(decoder, source, offset)
+        return decoder.decode(source, offset)
+
+    def transcode(self, path, strict=False):
+        """
+        transcode(path[, strict]) -> int
+
+        Writes the rows of the file to path, decompressed and back to back,
+        row_length bytes each, and returns the number of rows written. The
+        file is written under a temporary name first and then renamed, so
+        path never holds a partial file. This is how row cache entries are
+        made, see the cache_dir option.
 
-    def convert_file(self, out_file, delimiter=',', step_size=100000):
+        Rows that turn out shorter than row_length (from a damaged page)
+        are padded with zero bytes, unless strict is true, in which case a
+        ParseError is raised instead.
         """
-        convert_file(out_file[, delimiter[, step_size]]) -> None
+        row_length = self.properties.row_length
+        rows = 0
+        temp_path = '%s.%s.tmp' % (path, os.getpid())
+        try:
+            with open(temp_path, 'wb') as f:
+                for source, offset, count in self._iter_row_blocks():
+                    data = memoryview(source)[offset:offset + count *
+                                              row_length]
+                    f.write(data)
+                    if len(data) < count * row_length:
+                        if strict:
+                            raise ParseError('row %s is shorter than %s '
+                                             'bytes' % (rows + len(data) //
+                                                        row_length,
+                                                        row_length))
+                        # Keep the rows aligned after a short row
+                        f.write(b'\x00' * (count * row_length - len(data)))
+                    rows += count
+            if os.path.exists(path):
+                os.remove(path)
+            os.rename(temp_path, path)
+        except:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+        return rows
+
+    def convert_file(self, out_file, delimiter=',', step_size=100000,
+                     workers=None, columns=None, float_format=None,
+                     quoting=csv.QUOTE_MINIMAL, format='csv'):
+        """
+        convert_file(out_file[, delimiter[, step_size[, workers[, columns[,
+        float_format[, quoting[, format]]]]]]]) -> bool
 
         A convenience method to convert a SAS7BDAT file into a delimited
         text file. Defaults to comma separated. The step_size parameter
-        is uses to show progress on longer running conversions.
+        is uses to show progress on longer running conversions. The workers
+        and columns parameters are passed on to readlines().
+
+        Rows are decoded and formatted a batch of columns at a time (see
+        CSVFormatter) and each batch is written in one go. Numbers are
+        written as str() writes them unless float_format, a %-style format
+        such as '%.6g', is given. quoting is one of the csv.QUOTE_*
+        constants and means what it does for csv.writer. Returns False if
+        the rows could not be parsed.
+
+        With format='jsonl' the file is written as JSON Lines instead, one
+        object per row (see JSONLinesFormatter), and delimiter and quoting
+        are ignored.
         """
-        delimiter = str(delimiter)
+        if format not in self.OUTPUT_FORMATS:
+            raise ValueError('unknown format %r, expected one of %s' %
+                             (format, ', '.join(self.OUTPUT_FORMATS)))
+        decoder = self._get_row_decoder(columns)
+        if columns is None and self.selected_columns is None:
+            column_count = self.properties.column_count or 0
+        else:
+            column_count = len(decoder.indices)
+        if format == 'jsonl':
+            formatter = JSONLinesFormatter(decoder.names, decoder.kinds,
+                                           float_format)
+        else:
+            formatter = CSVFormatter(decoder.kinds, str(delimiter), quoting,
+                                     float_format)
+        row_count = self.properties.row_count or 0
         self.logger.debug('saving as: %s', out_file)
         out_f = None
         success = True
@@ -747,46 +2500,410 @@ SAS7BDAT object
                 out_f = sys.stdout
             else:
                 out_f = open(out_file, 'w')
-            out = csv.writer(out_f, lineterminator='\n', delimiter=delimiter)
             i = 0
-            for i, line in enumerate(self, 1):
-                if len(line) != (self.properties.column_count or 0):
-                    msg = 'parsed line into %s columns but was ' \
-                          'expecting %s.\n%s' %\
-                          (len(line), self.properties.column_count, line)
-                    self.logger.error(msg)
-                    success = False
-                    if self.logger.level == logging.DEBUG:
-                        raise ParseError(msg)
-                    break
-                if not i % step_size:
-                    self.logger.info(
-                        '%.1f%% complete',
-                        float(i) / self.properties.row_count * 100.0
-                    )
-                try:
-                    out.writerow(line)
-                except IOError:
-                    self.logger.warn('wrote %s lines before interruption', i)
-                    break
+            try:
+                if format == 'csv' and not self.skip_header:
+                    out_f.write(formatter.format_row(decoder.names))
+                for values in self._iter_column_lists(decoder, workers):
+                    if len(values) != column_count:
+                        msg = 'parsed rows into %s columns but was ' \
+                              'expecting %s.' % (len(values), column_count)
+                        self.logger.error(msg)
+                        success = False
+                        if self.logger.level == logging.DEBUG:
+                            raise ParseError(msg)
+                        break
+                    count = len(values[0]) if values else 0
+                    out_f.write(formatter.format_columns(values))
+                    if (i + count) // step_size > i // step_size:
+                        self.logger.info(
+                            '%.1f%% complete',
+                            float(i + count) / row_count * 100.0
+                        )
+                    i += count
+            except IOError:
+                self.logger.warn('wrote %s lines before interruption', i)
             self.logger.info(u'\u27f6 [%s] wrote %s of %s lines',
-                             os.path.basename(out_file), i - 1,
-                             self.properties.row_count or 0)
+                             os.path.basename(out_file), i, row_count)
         finally:
             if out_f is not None:
                 out_f.close()
         return success
 
-    def to_data_frame(self):
+    def _iter_column_lists(self, decoder, workers=None, batch_size=65536):
+        """
+        Yields the rows holding the columns of decoder, batch_size rows at a
+        time, as one list of values per column. Rows are read by readlines()
+        when workers are used.
+        """
+        if workers is None:
+            workers = self.workers
+        if not workers or workers <= 1:
+            for blocks in self._iter_block_batches(batch_size=batch_size):
+                yield decoder.decode_columns(blocks)
+            return
+        rows = self.readlines(workers=workers, columns=decoder.indices)
+        if not self.skip_header:
+            next(rows)
+        while True:
+            batch = list(itertools.islice(rows, batch_size))
+            if not batch:
+                break
+            yield [list(x) for x in zip(*batch)]
+
+    def to_arrow_reader(self, batch_size=65536, columns=None, where=None):
+        """
+        to_arrow_reader([batch_size[, columns[, where]]]) ->
+        pyarrow.RecordBatchReader
+
+        Returns a RecordBatchReader over the file, yielding batch_size rows
+        at a time. Batches are built from the column arrays decoded by the
+        'numpy' engine, typed as described in ArrowConverter, and are only
+        read when the reader gets to them. If columns is given, only those
+        columns are read. With where (see readlines()), only the matching
+        rows are. Requires NumPy and pyarrow.
+        """
+        import pyarrow as pa
+        if batch_size < 1:
+            raise ValueError('batch_size must be positive: %s' % batch_size)
+        converter = ArrowConverter(self, self._column_indices(columns))
+        row_filter = self._get_row_filter(where)
+        batches = (
+            converter.convert(blocks)
+            for blocks in self._iter_block_batches(batch_size=batch_size,
+                                                   row_filter=row_filter)
+        )
+        return pa.RecordBatchReader.from_batches(converter.schema, batches)
+
+    def to_parquet(self, path, row_group_size=65536, columns=None,
+                   where=None):
         """
-        to_data_frame() -> pandas.DataFrame object
+        to_parquet(path[, row_group_size[, columns[, where]]]) -> int
+
+        Writes the file to path as Parquet, one row group of row_group_size
+        rows at a time, and returns the number of rows written. Only one
+        row group is held in memory. The columns are typed as described in
+        ArrowConverter. If columns is given, only those columns are
+        written. With where (see readlines()), only the matching rows are.
+        Requires NumPy and pyarrow.
+        """
+        import pyarrow.parquet as pq
+        if row_group_size < 1:
+            raise ValueError('row_group_size must be positive: %s' %
+                             row_group_size)
+        converter = ArrowConverter(self, self._column_indices(columns))
+        row_filter = self._get_row_filter(where)
+        rows = 0
+        writer = pq.ParquetWriter(path, converter.schema)
+        try:
+            for blocks in self._iter_block_batches(batch_size=row_group_size,
+                                                   row_filter=row_filter):
+                batch = converter.convert(blocks)
+                writer.write_batch(batch, row_group_size=row_group_size)
+                rows += batch.num_rows
+        finally:
+            writer.close()
+        self.logger.info(u'\u27f6 [%s] wrote %s of %s lines',
+                         os.path.basename(path), rows,
+                         self.properties.row_count or 0)
+        return rows
+
+    def to_sqlite(self, db_path, table, columns=None, where=None,
+                  batch_size=65536, replace=False, pragmas=None):
+        """
+        to_sqlite(db_path, table[, columns[, where[, batch_size[, replace[,
+        pragmas]]]]]) -> int
+
+        Loads the rows of the file into a new table of the SQLite database
+        at db_path and returns the number of rows loaded. The table gets a
+        column per column of the file, with INTEGER affinity for 2 byte
+        integers, REAL for other numbers and TEXT for strings, dates,
+        datetimes and times, which are stored the way str() writes them.
+        Missing numbers, dates, datetimes and times are NULL. If replace is
+        true, an existing table of the same name is dropped first.
+
+        Rows are decoded a batch of columns at a time and inserted with
+        executemany(), batch_size rows at a time, all in one transaction.
+        pragmas maps pragma names to values set on the connection first,
+        e.g. SQLITE_BULK_PRAGMAS trades durability for loading speed.
+        columns and where mean what they do for readlines().
+        """
+        import sqlite3
+        decoder = self._get_row_decoder(columns)
+        row_filter = self._get_row_filter(where)
+
+        def quote(name):
+            return '"%s"' % name.replace('"', '""')
+        table = quote(table)
+        definitions = ', '.join(
+            '%s %s' % (quote(name), self.SQLITE_AFFINITIES[kind])
+            for name, kind in zip(decoder.names, decoder.kinds)
+        )
+        insert = 'INSERT INTO %s VALUES (%s)' % (
+            table, ', '.join('?' * len(decoder.names))
+        )
+        rows = 0
+        connection = sqlite3.connect(db_path, isolation_level=None)
+        try:
+            for name, value in sorted((pragmas or {}).items()):
+                connection.execute('PRAGMA %s = %s' % (name, value))
+            connection.execute('BEGIN')
+            try:
+                if replace:
+                    connection.execute('DROP TABLE IF EXISTS %s' % table)
+                connection.execute('CREATE TABLE %s (%s)' %
+                                   (table, definitions))
+                for blocks in self._iter_block_batches(
+                        batch_size=batch_size, row_filter=row_filter):
+                    values = [
+                        self._sqlite_values(x, kind) for x, kind in
+                        zip(decoder.decode_columns(blocks), decoder.kinds)
+                    ]
+                    connection.executemany(insert, zip(*values))
+                    rows += len(values[0]) if values else 0
+                connection.execute('COMMIT')
+            except:
+                connection.execute('ROLLBACK')
+                raise
+        finally:
+            connection.close()
+        self.logger.info(u'\u27f6 [%s] loaded %s of %s lines into %s',
+                         os.path.basename(db_path), rows,
+                         self.properties.row_count or 0, table)
+        return rows
+
+    @staticmethod
+    def _sqlite_values(values, kind):
+        """
+        Returns the values of a column of the given kind as they are stored
+        by to_sqlite().
+        """
+        if kind == 'string':
+            return values
+        elif kind in ('int', 'number'):
+            return [None if x == '' else x for x in values]
+        return [None if x == '' else str(x) for x in values]
+
+    def to_data_frame(self, workers=None, columns=None, strings=None,
+                      chunksize=None):
+        """
+        to_data_frame([workers[, columns[, strings[, chunksize]]]]) ->
+        pandas.DataFrame object
 
         A convenience method to convert a SAS7BDAT file into a pandas
-        DataFrame.
+        DataFrame. Each column is an array of properties.row_count rows,
+        allocated up front and filled a batch of rows at a time, so the
+        rows are never held as Python lists. Numbers are float64 (Int64 for
+        2 byte integers), dates and datetimes datetime64, times timedelta64
+        and strings object columns, or categoricals when strings is
+        'dictionary' (defaults to the strings option passed to the
+        constructor). Missing values are NaN, NaT or <NA>.
+
+        If workers is greater than one (defaults to the workers passed to
+        the constructor), ranges of rows are decoded in that many processes.
+        If columns is given, only those columns are read, in that order.
+        Requires NumPy.
+
+        If chunksize is given, returns a generator which yields DataFrames
+        of chunksize rows instead, read in this process. Every chunk has
+        the same columns and dtypes and its index carries on from the
+        previous one. Strings are always object columns then, as the
+        categories of a chunk would only be those seen so far.
+        """
+        import numpy as np
+        import pandas as pd
+        strings = self._resolve_option(strings, 'strings')
+        decoder = self._get_numpy_decoder(columns)
+        if chunksize is not None:
+            if chunksize < 1:
+                raise ValueError('chunksize must be positive: %s' %
+                                 chunksize)
+            return self._iter_data_frames(decoder, chunksize)
+        if workers is None:
+            workers = self.workers
+        parallel = workers and workers > 1
+        # Dictionary codes are only shared by the batches of one decoder,
+        # worker processes return their strings as objects
+        codes = strings == 'dictionary' and not parallel
+        row_count = self.properties.row_count or 0
+        arrays = collections.OrderedDict()
+        for _, name, kind, _ in decoder.fields:
+            if kind == 'string' and codes:
+                dtype = np.int32
+            else:
+                dtype = self.DATA_FRAME_DTYPES[kind]
+            arrays[name] = np.empty(row_count, dtype=dtype)
+        rows = self._fill_columns(arrays, decoder, workers, strings)
+        data = collections.OrderedDict()
+        for field, name, kind, _ in decoder.fields:
+            values = arrays[name][:rows]
+            if kind == 'int':
+                values = pd.arrays.IntegerArray(values,
+                                                np.zeros(rows, dtype=bool))
+            elif kind == 'string' and codes:
+                values = pd.Categorical.from_codes(
+                    values, decoder.string_decoders[field].categories
+                )
+            elif kind == 'string' and strings == 'dictionary':
+                values = pd.Categorical(values)
+            data[name] = values
+        return pd.DataFrame(data, columns=list(data), copy=False)
+
+    def _fill_columns(self, arrays, decoder, workers=None, strings='object'):
+        """
+        Copies the columns of decoder into the arrays, a dict of column name
+        to array, a batch of rows at a time. Rows are decoded in a pool of
+        processes when workers is greater than one. Returns the number of
+        rows copied.
+        """
+        if workers and workers > 1:
+            batches = self._map_row_ranges(_read_columns_worker, workers,
+                                           decoder.indices, 'datetime64')
+        else:
+            batches = (decoder.decode(x, 'datetime64', strings)
+                       for x in self._iter_block_batches())
+        rows = 0
+        for batch in batches:
+            count = 0
+            for name, values in batch.items():
+                if isinstance(values, DictionaryColumn):
+                    values = values.codes
+                count = len(values)
+                arrays[name][rows:rows + count] = values
+            rows += count
+        return rows
+
+    def _numpy_dtypes(self, decoder):
+        """
+        Returns (name, dtype) pairs for the columns of decoder, following
+        their lengths and formats: integers of the same width, float64,
+        datetime64[D], datetime64[ms], timedelta64[ms] and unicode strings
+        as long as the column.
+        """
+        dtypes = []
+        for _, name, kind, length in decoder.fields:
+            if kind == 'int':
+                dtype = 'i%d' % length
+            elif kind == 'string':
+                dtype = 'U%d' % max(length, 1)
+            else:
+                dtype = self.NUMPY_DTYPES[kind]
+            dtypes.append((name, dtype))
+        return dtypes
+
+    def to_numpy(self, workers=None, columns=None, structured=True):
+        """
+        to_numpy([workers[, columns[, structured]]]) -> numpy.ndarray
+
+        Reads the file into a structured array with one field per column,
+        or into an OrderedDict of column name to array when structured is
+        false. The dtypes follow the column lengths and formats: 1 and 2
+        byte integers keep their width, other numbers are float64, dates
+        datetime64[D], datetimes datetime64[ms], times timedelta64[ms] and
+        strings fixed width unicode. Missing numbers are NaN and missing
+        dates, datetimes and times NaT. The arrays are allocated once for
+        properties.row_count rows and filled a batch at a time.
+
+        workers and columns mean what they do for to_data_frame(). Requires
+        NumPy.
+        """
+        import numpy as np
+        if workers is None:
+            workers = self.workers
+        decoder = self._get_numpy_decoder(columns)
+        dtypes = self._numpy_dtypes(decoder)
+        row_count = self.properties.row_count or 0
+        if structured:
+            result = np.empty(row_count, dtype=np.dtype(
+                [(str(name), dtype) for name, dtype in dtypes]
+            ))
+            arrays = dict((name, result[str(name)]) for name, _ in dtypes)
+        else:
+            result = arrays = collections.OrderedDict(
+                (name, np.empty(row_count, dtype=dtype))
+                for name, dtype in dtypes
+            )
+        rows = self._fill_columns(arrays, decoder, workers)
+        if rows == row_count:
+            return result
+        if structured:
+            return result[:rows]
+        return collections.OrderedDict(
+            (name, values[:rows]) for name, values in result.items()
+        )
+
+    def save_npz(self, path, columns=None, compress=False):
+        """
+        save_npz(path[, columns[, compress]]) -> int
+
+        Saves the columns of the file to path as a .npz archive holding one
+        .npy array per column, typed like to_numpy(), and returns the number
+        of rows written. numpy.load(path) reads it back. The columns are
+        streamed to .npy files next to path a batch of rows at a time,
+        through memory maps, and then stored in the archive, deflated if
+        compress is true. If columns is given, only those columns are
+        saved. Requires NumPy.
+        """
+        import numpy as np
+        decoder = self._get_numpy_decoder(columns)
+        dtypes = self._numpy_dtypes(decoder)
+        row_count = self.properties.row_count or 0
+        temp_dir = tempfile.mkdtemp(
+            prefix='.%s.' % os.path.basename(path),
+            dir=os.path.dirname(os.path.abspath(path))
+        )
+        try:
+            arrays = collections.OrderedDict()
+            paths = []
+            for i, (name, dtype) in enumerate(dtypes):
+                paths.append(os.path.join(temp_dir, '%d.npy' % i))
+                arrays[name] = np.lib.format.open_memmap(
+                    paths[-1], mode='w+', dtype=dtype, shape=(row_count,)
+                )
+            rows = self._fill_columns(arrays, decoder)
+            for values in arrays.values():
+                values.flush()
+            arrays = values = None
+            if rows != row_count:
+                # Keep only the rows that were read
+                for npy_path in paths:
+                    np.save(npy_path + '.tmp.npy',
+                            np.load(npy_path, mmap_mode='r')[:rows])
+                    os.remove(npy_path)
+                    os.rename(npy_path + '.tmp.npy', npy_path)
+            with zipfile.ZipFile(path, 'w', zipfile.ZIP_DEFLATED
+                                 if compress else zipfile.ZIP_STORED,
+                                 allowZip64=True) as archive:
+                for (name, _), npy_path in zip(dtypes, paths):
+                    archive.write(npy_path, '%s.npy' % name)
+        finally:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+        return rows
+
+    def _iter_data_frames(self, decoder, chunksize):
         """
+        Yields the DataFrames of to_data_frame(chunksize=chunksize).
+        """
+        import numpy as np
         import pandas as pd
-        data = list(self.readlines())
-        return pd.DataFrame([dict(list(zip(data[0], x))) for x in data[1:]])
+        rows = 0
+        for blocks in self._iter_block_batches(batch_size=chunksize):
+            batch = decoder.decode(blocks, 'datetime64')
+            count = sum(x[2] for x in blocks)
+            data = collections.OrderedDict()
+            for (_, name, kind, _), values in zip(decoder.fields,
+                                                  batch.values()):
+                if kind == 'int':
+                    values = pd.arrays.IntegerArray(
+                        values, np.zeros(count, dtype=bool)
+                    )
+                else:
+                    values = values.astype(self.DATA_FRAME_DTYPES[kind],
+                                           copy=False)
+                data[name] = values
+            yield pd.DataFrame(data, columns=list(data), copy=False,
+                               index=pd.RangeIndex(rows, rows + count))
+            rows += count
 
 
 class Column(object):
@@ -811,6 +2928,287 @@ class SubheaderPointer(object):
         self.type = p_type
 
 
+class PageIndexEntry(object):
+    def __init__(self, page, offset, p_type, block_count, first_row,
+                 row_count, data_offset):
+        self.page = page
+        self.offset = offset
+        self.type = p_type
+        self.block_count = block_count
+        self.first_row = first_row
+        self.row_count = row_count
+        self.data_offset = data_offset
+
+    def __repr__(self):
+        return 'page %s: rows %s-%s' % (self.page, self.first_row,
+                                        self.first_row + self.row_count)
+
+
+class PageIndex(object):
+    """
+    Records where the rows of a sas7bdat file live: the file offset, type,
+    block count, first row number, row count and offset of the first row
+    of every page. Meta pages have no data offset since their rows are
+    scattered over the page as data subheaders.
+    """
+    VERSION = 1
+
+    def __init__(self, entries, file_size, file_mtime, page_length):
+        self.entries = entries
+        self.file_size = file_size
+        self.file_mtime = file_mtime
+        self.page_length = page_length
+        self._data_entries = [x for x in entries if x.row_count]
+        self._first_rows = [x.first_row for x in self._data_entries]
+        # The number of rows found in the file, fewer than
+        # properties.row_count when the file is truncated
+        self.row_count = sum(x.row_count for x in entries)
+
+    def __len__(self):
+        return len(self.entries)
+
+    @classmethod
+    def build(cls, parent):
+        """
+        Builds the index with a single scan over the page headers. Only
+        meta pages, whose rows are found through their subheader pointers,
+        are read in full.
+        """
+        header = parent.header
+        properties = parent.properties
+        reader = parent._page_reader
+        row_count = properties.row_count or 0
+        header_length = header.PAGE_BIT_OFFSET +\
+            header.SUBHEADER_POINTERS_OFFSET
+        entries = []
+        first_row = 0
+        for page in xrange(properties.page_count or 0):
+            offset = properties.header_length + page * properties.page_length
+            page_header = reader.read_at(offset, header_length)
+            if len(page_header) < header_length:
+                break
+            (parent.current_page_type,
+             parent.current_page_block_count,
+             parent.current_page_subheaders_count) =\
+                header.parse_page_header(page_header)
+            parent.current_page_data_subheader_pointers = []
+            if parent.current_page_type == header.PAGE_META_TYPE:
+                parent.cached_page = reader.read_at(
+                    offset, properties.page_length
+                )
+                header.process_page_metadata(data_only=True)
+            locations = parent._page_row_locations()
+            locations = locations[:row_count - first_row]
+            if parent.current_page_type == header.PAGE_META_TYPE or\
+                    not locations:
+                data_offset = None
+            else:
+                data_offset = locations[0][0]
+            entries.append(PageIndexEntry(
+                page, offset, parent.current_page_type,
+                parent.current_page_block_count, first_row, len(locations),
+                data_offset
+            ))
+            first_row += len(locations)
+        parent.cached_page = None
+        if first_row != row_count:
+            parent.logger.warning('page index found %s of %s rows',
+                                  first_row, row_count)
+        stat = os.stat(parent.path)
+        return cls(entries, stat.st_size, stat.st_mtime,
+                   properties.page_length)
+
+    def find_page(self, row):
+        """
+        Returns the entry of the page holding row.
+        """
+        i = bisect.bisect_right(self._first_rows, row) - 1
+        if i < 0 or row >= self._data_entries[i].first_row +\
+                self._data_entries[i].row_count:
+            raise IndexError('row %s not in page index' % row)
+        return self._data_entries[i]
+
+    def matches(self, parent):
+        stat = os.stat(parent.path)
+        return self.file_size == stat.st_size and\
+            self.file_mtime == stat.st_mtime and\
+            self.page_length == parent.properties.page_length
+
+    def save(self, path):
+        data = {
+            'version': self.VERSION,
+            'file_size': self.file_size,
+            'file_mtime': self.file_mtime,
+            'page_length': self.page_length,
+            'pages': [[x.page, x.offset, x.type, x.block_count, x.first_row,
+                       x.row_count, x.data_offset] for x in self.entries],
+        }
+        # Written under a temporary name and renamed, so readers never see
+        # a partial file
+        temp_path = '%s.%s.tmp' % (path, os.getpid())
+        try:
+            with open(temp_path, 'w') as f:
+                json.dump(data, f, separators=(',', ':'))
+            if os.path.exists(path):
+                os.remove(path)
+            os.rename(temp_path, path)
+        except:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+    @classmethod
+    def load(cls, path):
+        with open(path) as f:
+            data = json.load(f)
+        if data.get('version') != cls.VERSION:
+            raise ParseError('unsupported page index version: %s' %
+                             data.get('version'))
+        return cls([PageIndexEntry(*x) for x in data['pages']],
+                   data['file_size'], data['file_mtime'],
+                   data['page_length'])
+
+
+class RowCache(object):
+    """
+    An on-disk cache of decompressed rows. Each entry is a file written by
+    SAS7BDAT.transcode(), holding the rows of one compressed sas7bdat file
+    back to back, and is keyed by the path, size and modification time of
+    that file. Entries are memory-mapped for reading. Once the entries in
+    directory add up to more than max_size bytes the least recently used
+    ones are removed.
+
+    Files that cannot be cached get an empty marker file in place of an
+    entry, so they are not decompressed again on every open.
+    """
+    SUFFIX = '.sas7rows'
+    SKIP_SUFFIX = '.sas7skip'
+
+    def __init__(self, directory, max_size):
+        self.directory = directory
+        self.max_size = max_size
+        self.path = None
+        self._mmap = None
+        self.view = None
+        # The number of rows in the open entry
+        self.row_count = 0
+
+    def entry_path(self, parent):
+        stat = os.stat(parent.path)
+        key = '%s|%s|%r' % (os.path.abspath(parent.path), stat.st_size,
+                            stat.st_mtime)
+        return os.path.join(
+            self.directory,
+            hashlib.sha1(key.encode('utf8')).hexdigest() + self.SUFFIX
+        )
+
+    def open(self, parent):
+        """
+        open(parent) -> bool
+
+        Maps the entry for parent, transcoding it into the cache first if
+        there is no entry yet. The entry holds the rows that are actually
+        in the file, which may be fewer than properties.row_count for a
+        truncated file. Returns False, leaving the cache closed, if the
+        file has rows the cache cannot hold as they are (see transcode())
+        or the cache cannot be written or read.
+        """
+        try:
+            return self._open(parent)
+        except (IOError, OSError) as e:
+            parent.logger.warning('not caching rows: %s', e)
+            self.close()
+            return False
+
+    def _open(self, parent):
+        path = self.entry_path(parent)
+        skip_path = path[:-len(self.SUFFIX)] + self.SKIP_SUFFIX
+        if os.path.exists(skip_path):
+            parent.logger.debug('not caching rows of %s, see %s',
+                                parent.path, skip_path)
+            return False
+        row_length = parent.properties.row_length
+        if os.path.exists(path) and\
+                os.path.getsize(path) % row_length == 0 and\
+                os.path.getsize(path) // row_length <=\
+                (parent.properties.row_count or 0):
+            # Entries are renamed into place once complete. Mark the entry
+            # as recently used.
+            os.utime(path, None)
+            self.row_count = os.path.getsize(path) // row_length
+        else:
+            if not os.path.isdir(self.directory):
+                os.makedirs(self.directory)
+            parent.logger.debug('writing %s to row cache %s', parent.path,
+                                path)
+            try:
+                self.row_count = parent.transcode(path, strict=True)
+            except ParseError as e:
+                parent.logger.warning('not caching rows: %s', e)
+                open(skip_path, 'w').close()
+                return False
+            self.evict(keep=path)
+        self.path = path
+        if self.row_count:
+            with open(path, 'rb') as f:
+                self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.view = memoryview(self._mmap)
+        else:
+            self.view = memoryview(b'')
+        return True
+
+    def evict(self, keep=None):
+        """
+        Removes the least recently used entries until the cache holds no
+        more than max_size bytes. The entry at keep is never removed.
+        """
+        if self.max_size is None:
+            return
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(self.SUFFIX):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(x[1] for x in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_size:
+                break
+            if path == keep:
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def iter_blocks(self, row_length, start, stop, rows_per_block=65536):
+        """
+        Yields (source, offset, count) blocks of at most rows_per_block
+        rows for rows start through stop - 1 (stop is capped at row_count).
+        """
+        stop = min(stop, self.row_count)
+        for first in xrange(start, stop, rows_per_block):
+            count = min(rows_per_block, stop - first)
+            yield self.view, first * row_length, count
+
+    def close(self):
+        if self._mmap is None:
+            return
+        try:
+            self.view.release()
+            self._mmap.close()
+        except BufferError:
+            # Rows still hold views onto the mapping, it will be unmapped
+            # once they are garbage collected.
+            pass
+        self._mmap = None
+
+
 class ProcessingSubheader(object):
     TEXT_BLOCK_SIZE_LENGTH = 2
     ROW_LENGTH_OFFSET_MULTIPLIER = 5
@@ -1496,9 +3894,7 @@ class SASHeader(object):
     def parse_metadata(self):
         done = False
         while not done:
-            self.parent.cached_page = self.parent._file.read(
-                self.properties.page_length
-            )
+            self.parent.cached_page = self.parent._page_reader.read_page()
             if len(self.parent.cached_page) <= 0:
                 break
             if len(self.parent.cached_page) != self.properties.page_length:
@@ -1507,27 +3903,36 @@ class SASHeader(object):
                 )
             done = self.process_page_meta()
 
-    def read_page_header(self):
-        bit_offset = self.PAGE_BIT_OFFSET
-        vals = self.parent._read_bytes({
-            self.PAGE_TYPE_OFFSET + bit_offset: self.PAGE_TYPE_LENGTH,
-            self.BLOCK_COUNT_OFFSET + bit_offset: self.BLOCK_COUNT_LENGTH,
-            self.SUBHEADER_COUNT_OFFSET + bit_offset:
-                self.SUBHEADER_COUNT_LENGTH
-        })
-
-        self.parent.current_page_type = self.parent._read_val(
-            'h', vals[self.PAGE_TYPE_OFFSET + bit_offset],
+    def parse_page_header(self, page):
+        """
+        Returns the type, block count and subheader count stored in the
+        header of page.
+        """
+        parent = self.parent
+        offset = self.PAGE_BIT_OFFSET + self.PAGE_TYPE_OFFSET
+        page_type = parent._read_val(
+            'h', page[offset:offset + self.PAGE_TYPE_LENGTH],
             self.PAGE_TYPE_LENGTH
         )
-        self.parent.current_page_block_count = self.parent._read_val(
-            'h', vals[self.BLOCK_COUNT_OFFSET + bit_offset],
+        offset = self.PAGE_BIT_OFFSET + self.BLOCK_COUNT_OFFSET
+        block_count = parent._read_val(
+            'h', page[offset:offset + self.BLOCK_COUNT_LENGTH],
             self.BLOCK_COUNT_LENGTH
         )
-        self.parent.current_page_subheaders_count = self.parent._read_val(
-            'h', vals[self.SUBHEADER_COUNT_OFFSET + bit_offset],
+        offset = self.PAGE_BIT_OFFSET + self.SUBHEADER_COUNT_OFFSET
+        subheaders_count = parent._read_val(
+            'h', page[offset:offset + self.SUBHEADER_COUNT_LENGTH],
             self.SUBHEADER_COUNT_LENGTH
         )
+        return page_type, block_count, subheaders_count
+
+    def read_page_header(self):
+        parent = self.parent
+        (parent.current_page_type,
+         parent.current_page_block_count,
+         parent.current_page_subheaders_count) = self.parse_page_header(
+            parent.cached_page
+        )
 
     def process_page_meta(self):
         self.read_page_header()
@@ -1536,7 +3941,7 @@ class SASHeader(object):
         return self.parent.current_page_type in self.PAGE_MIX_DATA_TYPE or \
             self.parent.current_page_data_subheader_pointers
 
-    def process_page_metadata(self):
+    def process_page_metadata(self, data_only=False):
         parent = self.parent
         bit_offset = self.PAGE_BIT_OFFSET
         for i in xrange(parent.current_page_subheaders_count):
@@ -1556,6 +3961,8 @@ class SASHeader(object):
                 )
                 if subheader_index is not None:
                     if subheader_index != self.DATA_SUBHEADER_INDEX:
+                        if data_only:
+                            continue
                         cls = self.SUBHEADER_INDEX_TO_CLASS.get(
                             subheader_index
                         )
@@ -1614,6 +4021,25 @@ class SASHeader(object):
                                 subheader_compression, subheader_type)
 
 
+# The SAS7BDAT instance of a worker process started by _map_row_ranges
+_worker_reader = None
+
+
+def _init_worker(path, options, page_index):
+    global _worker_reader
+    _worker_reader = SAS7BDAT(path, **options)
+    _worker_reader.page_index = page_index
+
+
+def _read_rows_worker(start, stop, columns, where):
+    return _worker_reader.read_rows(start, stop, columns=columns, where=where)
+
+
+def _read_columns_worker(start, stop, columns, temporal):
+    return _worker_reader.read_columns(start, stop, columns=columns,
+                                       temporal=temporal, strings='object')
+
+
 @atexit.register
 def _close_files():
     for f in SAS7BDAT._open_files:
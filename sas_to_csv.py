@@ -4,11 +4,15 @@ from __future__ import print_function
 from sas7bdat import SAS7BDAT
 
 import glob
+import multiprocessing
+import optparse
+import os
+import time
 
 
 def to_csv(filename):
     fileout = '%s.csv' % filename
-    fw = open(fileout, 'wb')
+    fw = open(fileout, 'w')
 
     def to_file(value):
         '''
@@ -16,23 +20,54 @@ def to_csv(filename):
         '''
         print(value, sep=' ', end='\n', file=fw)
 
-    with SAS7BDAT(filename) as f:
-        for row in f:
-            print(','.join(str(v) for v in row), sep=' ', end='\n', file=fw)
-
-    fw.close()
+    try:
+        with SAS7BDAT(filename) as f:
+            for row in f:
+                print(','.join(str(v) for v in row), sep=' ', end='\n',
+                      file=fw)
+    except Exception as e:
+        print('Failed to convert %s: %s' % (filename, e))
+        return filename, False
+    finally:
+        fw.close()
+    return filename, True
 
 
 def get_files_names(file_ext='*.sas7bdat'):
     return glob.glob(file_ext)
 
 
-def to_csv_of_all_files():
-    for filename in get_files_names():
-        to_csv(filename)
+def to_csv_of_all_files(jobs=1):
+    filenames = get_files_names()
+    started = time.time()
+    if jobs > 1 and len(filenames) > 1:
+        pool = multiprocessing.Pool(min(jobs, len(filenames)))
+        try:
+            results = pool.map(to_csv, filenames, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        results = [to_csv(filename) for filename in filenames]
+    elapsed = time.time() - started
 
+    failed = [filename for filename, success in results if not success]
+    if failed:
+        print('Failed to convert %s of %s files' %
+              (len(failed), len(filenames)))
+    converted = [filename for filename, success in results if success]
+    if converted:
+        size = sum(os.path.getsize(x) for x in converted) / 1024.0 ** 2
+        print('Read %.1f MB in %.1f seconds (%.1f MB/s)' %
+              (size, elapsed, size / max(elapsed, 1e-6)))
     print('Done ... to csv')
 
 
 if __name__ == "__main__":
-    to_csv_of_all_files()
+    parser = optparse.OptionParser()
+    parser.add_option('--jobs', action='store', default=1, metavar='N',
+                      type='int',
+                      help="Convert up to N files at once. Defaults to "
+                           "%default.")
+    options, args = parser.parse_args()
+    to_csv_of_all_files(jobs=options.jobs)